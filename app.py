@@ -4,20 +4,539 @@ Flask Web Application for The People DB
 Provides a web interface for managing contacts with Bootstrap UI
 """
 
+import base64
+import cProfile
+import functools
+import itertools
 import json
+import logging
 import os
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, send_file
+import pstats
+import secrets
+import tempfile
+import threading
+import time
+import zlib
+from collections import deque
+from urllib.parse import urlencode
+from flask import Flask, Response, abort, g, has_request_context, make_response, render_template, request, redirect, url_for, flash, jsonify, session
+from flask import before_render_template, template_rendered
+from flask.json.provider import DefaultJSONProvider
 from flask_wtf import FlaskForm
-from wtforms import StringField, TextAreaField, BooleanField, SubmitField
+from flask_wtf.file import FileField, FileAllowed, FileRequired
+from wtforms import StringField, TextAreaField, BooleanField, HiddenField, SubmitField
 from wtforms.validators import DataRequired, Optional
-from datetime import datetime
-from database import ContactDatabase
+from datetime import datetime, timedelta, timezone
+from database import ContactDatabase, ConcurrentUpdateError, QueryStats, UPDATABLE_COLUMNS
+from importer import import_contacts as import_contacts_from_file
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, SIZE_BUCKETS, Counter, Gauge, Histogram, Registry, database_collector
+
+# Try to import brotli for better compression, fall back to gzip only if not available
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
 
 app = Flask(__name__)
 app.secret_key = 'your-secret-key-change-this-in-production'
 
+# Statement timing and a slow-query log, off unless PEOPLEDB_SLOW_QUERY_MS is set
+SLOW_QUERY_MS = os.environ.get('PEOPLEDB_SLOW_QUERY_MS')
+
 # Initialize database
-db = ContactDatabase()
+db = ContactDatabase(query_stats=QueryStats(
+    slow_threshold_ms=float(SLOW_QUERY_MS),
+    explain_slow=os.environ.get('PEOPLEDB_EXPLAIN_SLOW') == '1',
+    slow_log_path=os.environ.get('PEOPLEDB_SLOW_QUERY_LOG')
+) if SLOW_QUERY_MS else None)
+
+# Parser processes for /import uploads; None picks one per CPU for large files
+app.config.setdefault('IMPORT_WORKERS', None)
+
+# Response compression: bodies below COMPRESS_MIN_SIZE bytes are sent as-is
+# (streamed bodies are always compressed); levels trade CPU for bytes
+app.config.setdefault('COMPRESS_MIN_SIZE', 1024)
+app.config.setdefault('COMPRESS_LEVEL', 6)           # gzip, 1-9
+app.config.setdefault('COMPRESS_BROTLI_QUALITY', 4)  # brotli, 0-11
+app.config.setdefault('COMPRESS_MIMETYPES', {
+    'text/html', 'text/csv', 'text/plain', 'application/json', 'application/x-ndjson'
+})
+
+# Per-request Server-Timing header, optionally also logged as one JSON line per request
+app.config.setdefault('SERVER_TIMING', True)
+app.config.setdefault('SERVER_TIMING_LOG', False)
+
+# Requests carrying this token (?profile=<token> or an X-Profile-Token header) run
+# under cProfile and are listed at /debug/profiles; unset means profiling is off
+app.config.setdefault('PROFILER_TOKEN', os.environ.get('PEOPLEDB_PROFILER_TOKEN'))
+
+# Contacts per page on the home page, and default/maximum page sizes for /api/contacts
+PAGE_SIZE = 50
+API_PAGE_SIZE = 100
+API_MAX_PAGE_SIZE = 1000
+
+# Contacts encoded per chunk when streaming /api/contacts
+STREAM_CHUNK_SIZE = 500
+
+# Largest array accepted by POST /api/contacts (inserted in one transaction)
+API_MAX_BULK_CONTACTS = 10000
+
+# Read-only contact fields that clients may echo back in JSON bodies
+READ_ONLY_FIELDS = {'id', 'created_at', 'updated_at', 'version'}
+
+# Request telemetry served at /metrics
+metrics_registry = Registry()
+REQUEST_LATENCY = metrics_registry.register(Histogram(
+    'peopledb_http_request_duration_seconds', 'Time until the response headers, by route',
+    ('endpoint', 'method')))
+REQUEST_COUNT = metrics_registry.register(Counter(
+    'peopledb_http_requests_total', 'Requests by route and status code', ('endpoint', 'method', 'status')))
+REQUESTS_IN_FLIGHT = metrics_registry.register(Gauge(
+    'peopledb_http_requests_in_flight', 'Requests currently being handled'))
+RESPONSE_SIZE = metrics_registry.register(Histogram(
+    'peopledb_http_response_size_bytes', 'Response body bytes sent, after compression',
+    ('endpoint', 'method'), buckets=SIZE_BUCKETS))
+metrics_registry.add_collector(database_collector(db))
+
+def route_labels():
+    """Metric labels for the current request; unrouted requests share one label."""
+    return {'endpoint': request.endpoint or 'unmatched', 'method': request.method}
+
+def count_bytes(chunks, observe):
+    """Pass a streamed body through, reporting its total size once it is finished."""
+    size = 0
+    try:
+        for chunk in chunks:
+            size += len(chunk.encode('utf-8') if isinstance(chunk, str) else chunk)
+            yield chunk
+    finally:
+        close = getattr(chunks, 'close', None)
+        if close:
+            close()
+        observe(size)
+
+@app.before_request
+def start_request_metrics():
+    g.metrics_started = time.perf_counter()
+    REQUESTS_IN_FLIGHT.inc()
+
+# Registered before the other after_request hooks so it runs last and sees compressed sizes
+@app.after_request
+def record_request_metrics(response):
+    """Record latency, status code and response size for the route"""
+    started = g.pop('metrics_started', None)
+    if started is None:
+        return response
+    
+    labels = route_labels()
+    REQUEST_LATENCY.observe(time.perf_counter() - started, **labels)
+    REQUEST_COUNT.inc(status=response.status_code, **labels)
+    if response.is_streamed:
+        response.response = count_bytes(response.response, lambda size: RESPONSE_SIZE.observe(size, **labels))
+    else:
+        RESPONSE_SIZE.observe(response.content_length or 0, **labels)
+    return response
+
+@app.teardown_request
+def finish_request_metrics(exc):
+    """Leave the in-flight count; requests that raised never reached after_request"""
+    if 'metrics_started' in g:
+        labels = route_labels()
+        REQUEST_LATENCY.observe(time.perf_counter() - g.pop('metrics_started'), **labels)
+        REQUEST_COUNT.inc(status=500, **labels)
+    REQUESTS_IN_FLIGHT.dec()
+
+# Timed phases in Server-Timing header order, with their descriptions
+SERVER_TIMING_PHASES = {
+    'db': 'Database',
+    'decode': 'Row decoding',
+    'serialize': 'JSON serialization',
+    'render': 'Template rendering',
+    'filters': 'Template filters',
+}
+
+# Receives the SERVER_TIMING_LOG lines; logs to stderr unless handlers are configured
+timing_log = logging.getLogger('peopledb.server_timing')
+timing_log.setLevel(logging.INFO)
+if not timing_log.handlers:
+    timing_log.addHandler(logging.StreamHandler())
+
+def record_phase(phase, seconds):
+    """Add time spent in ``phase`` to the current request's Server-Timing totals"""
+    if not has_request_context() or not app.config['SERVER_TIMING']:
+        return
+    timings = g.setdefault('server_timing', {})
+    total, count = timings.get(phase, (0.0, 0))
+    timings[phase] = (total + seconds, count + 1)
+
+def timed_phase(phase):
+    """Decorator that records each call's duration under ``phase``"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record_phase(phase, time.perf_counter() - started)
+        return wrapper
+    return decorator
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that records jsonify() responses as the serialize phase
+    
+    Only response() is timed; dumps() is also used to sign the session cookie.
+    """
+    
+    def response(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return super().response(*args, **kwargs)
+        finally:
+            record_phase('serialize', time.perf_counter() - started)
+
+app.json = TimedJSONProvider(app)
+db.phase_timer = record_phase
+
+@before_render_template.connect_via(app)
+def start_render_timer(sender, template, context, **extra):
+    if has_request_context():
+        g.render_started = time.perf_counter()
+
+@template_rendered.connect_via(app)
+def finish_render_timer(sender, template, context, **extra):
+    started = g.pop('render_started', None) if has_request_context() else None
+    if started is not None:
+        record_phase('render', time.perf_counter() - started)
+
+@app.before_request
+def start_server_timing():
+    g.server_timing_started = time.perf_counter()
+
+@app.after_request
+def add_server_timing(response):
+    """Report the request's time per phase in a Server-Timing header"""
+    started = g.pop('server_timing_started', None)
+    if started is None or not app.config['SERVER_TIMING']:
+        return response
+    
+    total = time.perf_counter() - started
+    timings = g.pop('server_timing', {})
+    entries = []
+    for phase, description in SERVER_TIMING_PHASES.items():
+        if phase in timings:
+            seconds, count = timings[phase]
+            entries.append(f'{phase};dur={seconds * 1000:.2f};desc="{description} ({count})"')
+    entries.append(f'total;dur={total * 1000:.2f}')
+    response.headers.add('Server-Timing', ', '.join(entries))
+    
+    if app.config['SERVER_TIMING_LOG']:
+        timing_log.info(json.dumps({
+            'event': 'server_timing',
+            'method': request.method,
+            'path': request.path,
+            'endpoint': request.endpoint,
+            'status': response.status_code,
+            'total_ms': round(total * 1000, 3),
+            'phases': {phase: {'ms': round(seconds * 1000, 3), 'count': count}
+                       for phase, (seconds, count) in timings.items()}
+        }))
+    return response
+
+# Profiles kept for /debug/profiles (oldest dropped first) and functions kept per profile
+PROFILER_MAX_PROFILES = 20
+PROFILER_TOP_N = 40
+
+_profiles = deque(maxlen=PROFILER_MAX_PROFILES)
+_profile_ids = itertools.count(1)
+# Python 3.12+ allows one active cProfile profiler per process, so profile one request at a time
+_profiler_lock = threading.Lock()
+
+def profiler_authorized():
+    """Whether profiling is enabled and the request carries the profiler token"""
+    token = app.config['PROFILER_TOKEN']
+    if not token:
+        return False
+    offered = request.headers.get('X-Profile-Token') or request.args.get('profile')
+    return bool(offered) and secrets.compare_digest(offered.encode('utf-8'), token.encode('utf-8'))
+
+def summarize_profile(profiler, limit=PROFILER_TOP_N):
+    """Return (total calls, top ``limit`` functions by cumulative time) of a finished profile"""
+    stats = pstats.Stats(profiler)
+    functions = []
+    for (filename, line, name), (primitive, calls, tottime, cumtime, _) in stats.stats.items():
+        location = name if filename == '~' else f"{os.sep.join(filename.split(os.sep)[-2:])}:{line}({name})"
+        functions.append({
+            'function': location,
+            'calls': calls,
+            'primitive_calls': primitive,
+            'tottime_ms': tottime * 1000,
+            'cumtime_ms': cumtime * 1000
+        })
+    functions.sort(key=lambda entry: entry['cumtime_ms'], reverse=True)
+    return stats.total_calls, functions[:limit]
+
+@app.before_request
+def start_profiler():
+    if not app.config['PROFILER_TOKEN'] or request.endpoint == 'debug_profiles' or not profiler_authorized():
+        return
+    if not _profiler_lock.acquire(blocking=False):
+        g.profile_busy = True
+        return
+    
+    g.profile_started = time.perf_counter()
+    g.profiler = cProfile.Profile()
+    g.profiler.enable()
+
+@app.after_request
+def finish_profiler(response):
+    """Store the request's profile and name it in an X-Profile-Id header"""
+    if g.pop('profile_busy', False):
+        response.headers['X-Profile'] = 'busy'
+        return response
+    
+    profiler = g.pop('profiler', None)
+    if profiler is None:
+        return response
+    profiler.disable()
+    _profiler_lock.release()
+    
+    duration = time.perf_counter() - g.pop('profile_started')
+    total_calls, functions = summarize_profile(profiler)
+    query = urlencode([(key, value) for key, value in request.args.items(multi=True) if key != 'profile'])
+    profile_id = next(_profile_ids)
+    _profiles.append({
+        'id': profile_id,
+        'time': datetime.now(timezone.utc),
+        'method': request.method,
+        'path': request.path + (f'?{query}' if query else ''),
+        'endpoint': request.endpoint,
+        'status': response.status_code,
+        'duration_ms': duration * 1000,
+        'total_calls': total_calls,
+        # Streamed bodies are generated after this point and are not in the profile
+        'streamed': response.is_streamed,
+        'functions': functions
+    })
+    response.headers['X-Profile-Id'] = str(profile_id)
+    return response
+
+@app.teardown_request
+def stop_profiler(exc):
+    """Stop a profile whose request raised before after_request ran"""
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        profiler.disable()
+        _profiler_lock.release()
+
+# Distinguishes this process's data versions from those of earlier runs in ETags
+BOOT_ID = secrets.token_hex(4)
+
+# Last-Modified time of the most recent data version this process has served
+_last_modified = {'version': None, 'time': None}
+_last_modified_lock = threading.Lock()
+
+def current_validators():
+    """Return the (ETag, Last-Modified) pair for the current contact data.
+    
+    Both come from db.data_version(), so computing them reads no contact
+    rows. Last-Modified is when this process first saw the version, kept
+    strictly increasing at HTTP's one-second resolution.
+    """
+    version = db.data_version()
+    with _last_modified_lock:
+        if version != _last_modified['version']:
+            now = datetime.now(timezone.utc).replace(microsecond=0)
+            previous = _last_modified['time']
+            _last_modified['version'] = version
+            _last_modified['time'] = max(now, previous + timedelta(seconds=1)) if previous else now
+        last_modified = _last_modified['time']
+    
+    return f'{BOOT_ID}-{version}', last_modified
+
+def has_pending_flashes():
+    """Whether the session holds flash messages, without touching it when there is no cookie"""
+    if app.config['SESSION_COOKIE_NAME'] not in request.cookies:
+        return False
+    return '_flashes' in session
+
+def conditional(view):
+    """Answer GET requests with 304 Not Modified while the data is unchanged.
+    
+    The validators are checked before the view runs, so an unchanged poll
+    costs one PRAGMA. Pages with pending flash messages are rendered
+    normally and left untagged, since the message is shown only once.
+    The session is only opened when the request carries a session cookie,
+    so cookieless responses (API clients) don't get ``Vary: Cookie``.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if request.method not in ('GET', 'HEAD') or has_pending_flashes():
+            return view(*args, **kwargs)
+        
+        etag, last_modified = current_validators()
+        if request.if_none_match:
+            # If-None-Match takes precedence over If-Modified-Since (RFC 9110)
+            not_modified = request.if_none_match.contains_weak(etag)
+        elif request.if_modified_since:
+            not_modified = last_modified <= request.if_modified_since
+        else:
+            not_modified = False
+        
+        if not_modified:
+            response = Response(status=304)
+        else:
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+        
+        response.set_etag(etag, weak=True)
+        response.last_modified = last_modified
+        # /api/contacts picks JSON or NDJSON from the Accept header
+        response.vary.add('Accept')
+        # Let clients cache but revalidate on every use
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+    
+    return wrapper
+
+def make_compressor(encoding):
+    """Return (compress, flush, finish) callables for 'br' or 'gzip'."""
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=app.config['COMPRESS_BROTLI_QUALITY'])
+        return compressor.process, compressor.flush, compressor.finish
+    
+    # wbits 16 + MAX_WBITS produces a gzip header and trailer
+    compressor = zlib.compressobj(app.config['COMPRESS_LEVEL'], zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return (compressor.compress, lambda: compressor.flush(zlib.Z_SYNC_FLUSH),
+            lambda: compressor.flush(zlib.Z_FINISH))
+
+def compress_chunks(chunks, encoding):
+    """Compress a streamed body chunk by chunk.
+    
+    Each chunk is flushed so clients can decode rows as they arrive; the
+    underlying iterator is closed when the response is.
+    """
+    compress, flush, finish = make_compressor(encoding)
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            if chunk:
+                yield compress(chunk) + flush()
+        yield finish()
+    finally:
+        close = getattr(chunks, 'close', None)
+        if close:
+            close()
+
+@app.after_request
+def compress_response(response):
+    """Compress text responses with brotli or gzip when the client accepts it"""
+    if (response.mimetype not in app.config['COMPRESS_MIMETYPES'] or
+            response.status_code < 200 or response.status_code in (204, 304) or
+            'Content-Encoding' in response.headers or request.method == 'HEAD'):
+        return response
+    
+    response.vary.add('Accept-Encoding')
+    offered = ['br', 'gzip'] if BROTLI_AVAILABLE else ['gzip']
+    encoding = request.accept_encodings.best_match(offered)
+    if not encoding:
+        return response
+    
+    if response.is_streamed:
+        response.response = compress_chunks(response.response, encoding)
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < app.config['COMPRESS_MIN_SIZE']:
+            return response
+        compress, _, finish = make_compressor(encoding)
+        response.set_data(compress(data) + finish())
+    
+    response.headers['Content-Encoding'] = encoding
+    # The encoded bytes differ, so only a weak validator still holds
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+def encode_cursor(cursor):
+    """Encode a (name, id) pagination cursor as an opaque URL-safe token."""
+    if cursor is None:
+        return None
+    raw = json.dumps(list(cursor), separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+def decode_cursor(token):
+    """Decode a token from encode_cursor; raises ValueError if it is malformed."""
+    if not token:
+        return None
+    try:
+        name, contact_id = json.loads(base64.urlsafe_b64decode(token.encode('ascii')))
+        return str(name), int(contact_id)
+    except (TypeError, ValueError, UnicodeError, json.JSONDecodeError):
+        raise ValueError(f"Invalid cursor: {token!r}")
+
+def parse_contact_json(data, partial=False):
+    """Validate a JSON contact the way ContactForm does; raises ValueError.
+    
+    Returns add_contact/update_contact keyword arguments. With partial=True
+    (PATCH) only the fields present are returned and name may be omitted.
+    Social media may be an object or a JSON string, and tags a list or a
+    comma-separated string, mirroring the form fields.
+    """
+    if not isinstance(data, dict):
+        raise ValueError('Each contact must be a JSON object')
+    
+    unknown = set(data) - set(UPDATABLE_COLUMNS) - READ_ONLY_FIELDS
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(sorted(unknown))}")
+    
+    if not partial and 'name' not in data:
+        raise ValueError('Name is required')
+    
+    contact = {}
+    for field in ('name', 'nickname', 'birthday', 'address', 'personality_notes'):
+        if field not in data:
+            continue
+        value = data[field] if data[field] is not None else ''
+        if not isinstance(value, str):
+            raise ValueError(f"'{field}' must be a string")
+        contact[field] = value
+    
+    if 'name' in contact:
+        contact['name'] = contact['name'].strip()
+        if not contact['name']:
+            raise ValueError('Name is required')
+    
+    if 'social_media' in data:
+        social_media = data['social_media'] or {}
+        if isinstance(social_media, str):
+            try:
+                social_media = json.loads(social_media) if social_media.strip() else {}
+            except json.JSONDecodeError:
+                raise ValueError('Invalid JSON format for social media')
+        if not isinstance(social_media, dict):
+            raise ValueError('Social media must be a JSON object')
+        contact['social_media'] = social_media
+    
+    if 'tags' in data:
+        tags = data['tags'] or []
+        if isinstance(tags, str):
+            tags = tags.split(',')
+        if not isinstance(tags, list) or not all(isinstance(tag, str) for tag in tags):
+            raise ValueError('Tags must be a list of strings or a comma-separated string')
+        contact['tags'] = [tag.strip() for tag in tags if tag.strip()]
+    
+    for field in ('like_as_friend', 'like_romantically'):
+        if field in data:
+            if not isinstance(data[field], bool):
+                raise ValueError(f"'{field}' must be true or false")
+            contact[field] = data[field]
+    
+    return contact
 
 class ContactForm(FlaskForm):
     name = StringField('Name', validators=[DataRequired()], render_kw={"class": "form-control"})
@@ -29,13 +548,24 @@ class ContactForm(FlaskForm):
     tags = StringField('Tags (comma-separated)', validators=[Optional()], render_kw={"class": "form-control", "placeholder": "friend, work, family"})
     like_as_friend = BooleanField('I like this person as a friend', render_kw={"class": "form-check-input"})
     like_romantically = BooleanField('I like this person romantically', render_kw={"class": "form-check-input"})
+    # Version of the contact the edit form was loaded from
+    version = HiddenField()
     submit = SubmitField('Save Contact', render_kw={"class": "btn btn-primary"})
 
+class ImportForm(FlaskForm):
+    file = FileField('CSV or NDJSON file', validators=[
+        FileRequired(),
+        FileAllowed(['csv', 'ndjson', 'jsonl', 'json'], 'Upload a .csv or .ndjson file')
+    ], render_kw={"class": "form-control"})
+    submit = SubmitField('Import Contacts', render_kw={"class": "btn btn-primary"})
+
 @app.route('/')
+@conditional
 def index():
     """Home page showing all contacts"""
     search_query = request.args.get('search', '')
     tag_filter = request.args.get('tag', '')
+    next_cursor = None
     
     if search_query:
         contacts = db.search_contacts(search_query)
@@ -44,15 +574,18 @@ def index():
         contacts = db.filter_by_tag(tag_filter)
         title = f"Contacts with tag '{tag_filter}'"
     else:
-        contacts = db.get_all_contacts()
+        try:
+            after = decode_cursor(request.args.get('cursor', ''))
+        except ValueError:
+            after = None  # Stale or hand-edited link: start from the first page
+        contacts, next_cursor = db.list_contacts(after=after, limit=PAGE_SIZE)
         title = "All Contacts"
     
     # Get all tags for the filter dropdown
     all_tags = db.get_all_tags()
     
     # Count statistics
-    total_contacts = len(db.get_all_contacts())
-    total_tags = len(all_tags)
+    stats = db.get_stats()
     
     return render_template('index.html', 
                          contacts=contacts, 
@@ -60,8 +593,11 @@ def index():
                          search_query=search_query,
                          tag_filter=tag_filter,
                          all_tags=all_tags,
-                         total_contacts=total_contacts,
-                         total_tags=total_tags)
+                         stats=stats,
+                         total_contacts=stats['total_contacts'],
+                         total_tags=stats['unique_tags'],
+                         next_cursor=encode_cursor(next_cursor),
+                         is_first_page=not request.args.get('cursor'))
 
 @app.route('/add', methods=['GET', 'POST'])
 def add_contact():
@@ -106,6 +642,7 @@ def add_contact():
     return render_template('add_contact.html', form=form)
 
 @app.route('/contact/<int:contact_id>')
+@conditional
 def view_contact(contact_id):
     """View a specific contact"""
     contact = db.get_contact_by_id(contact_id)
@@ -141,19 +678,20 @@ def edit_contact(contact_id):
             if form.tags.data.strip():
                 tags = [tag.strip() for tag in form.tags.data.split(',') if tag.strip()]
             
-            # Update contact in database
-            success = db.update_contact(
-                contact_id=contact_id,
-                name=form.name.data,
-                nickname=form.nickname.data,
-                birthday=form.birthday.data,
-                address=form.address.data,
-                personality_notes=form.personality_notes.data,
-                social_media=social_media,
-                tags=tags,
-                like_as_friend=form.like_as_friend.data,
-                like_romantically=form.like_romantically.data
-            )
+            # Update only the fields that changed, unless the contact changed first
+            changes = db.changed_fields(contact, {
+                'name': form.name.data,
+                'nickname': form.nickname.data,
+                'birthday': form.birthday.data,
+                'address': form.address.data,
+                'personality_notes': form.personality_notes.data,
+                'social_media': social_media,
+                'tags': tags,
+                'like_as_friend': form.like_as_friend.data,
+                'like_romantically': form.like_romantically.data
+            })
+            expected_version = int(form.version.data) if form.version.data else None
+            success = db.update_contact(contact_id=contact_id, expected_version=expected_version, **changes)
             
             if success:
                 flash(f'Contact "{form.name.data}" updated successfully!', 'success')
@@ -161,6 +699,12 @@ def edit_contact(contact_id):
             else:
                 flash('Failed to update contact', 'error')
             
+        except ConcurrentUpdateError as e:
+            # Keep the user's input; saving again deliberately overwrites the newer version
+            form.version.data = e.current_version
+            flash('This contact was changed elsewhere while you were editing. '
+                  'Review the current details and save again to overwrite them.', 'warning')
+            contact = db.get_contact_by_id(contact_id) or contact
         except Exception as e:
             flash(f'Error updating contact: {str(e)}', 'error')
     
@@ -175,6 +719,7 @@ def edit_contact(contact_id):
         form.tags.data = ', '.join(contact['tags'])
         form.like_as_friend.data = contact.get('like_as_friend', False)
         form.like_romantically.data = contact.get('like_romantically', False)
+        form.version.data = contact['version']
     
     return render_template('edit_contact.html', form=form, contact=contact)
 
@@ -199,49 +744,264 @@ def delete_contact(contact_id):
 
 @app.route('/export')
 def export_contacts():
-    """Export contacts to CSV"""
+    """Export contacts to CSV, streamed straight from the database"""
+    filename = f"contacts_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
     try:
-        filename = db.export_to_csv()
-        return send_file(filename, as_attachment=True, download_name=filename)
+        chunks = db.iter_csv()
+        # Pull the first chunk now so database errors can still redirect
+        first_chunk = next(chunks)
     except Exception as e:
         flash(f'Error exporting contacts: {str(e)}', 'error')
         return redirect(url_for('index'))
+    
+    def generate():
+        yield first_chunk
+        yield from chunks
+    
+    return Response(generate(), mimetype='text/csv',
+                    headers={'Content-Disposition': f'attachment; filename={filename}'})
+
+def stream_contacts_json(contacts, chunk_size=STREAM_CHUNK_SIZE):
+    """Encode contacts as a {"contacts": [...], "total": N} document, chunk by chunk."""
+    yield '{"contacts":['
+    total = 0
+    buffer = []
+    for contact in contacts:
+        buffer.append(json.dumps(contact, separators=(',', ':')))
+        if len(buffer) >= chunk_size:
+            yield (',' if total else '') + ','.join(buffer)
+            total += len(buffer)
+            buffer = []
+    if buffer:
+        yield (',' if total else '') + ','.join(buffer)
+        total += len(buffer)
+    yield f'],"total":{total}}}'
+
+def stream_contacts_ndjson(contacts, chunk_size=STREAM_CHUNK_SIZE):
+    """Encode contacts as newline-delimited JSON, chunk by chunk."""
+    buffer = []
+    for contact in contacts:
+        buffer.append(json.dumps(contact, separators=(',', ':')) + '\n')
+        if len(buffer) >= chunk_size:
+            yield ''.join(buffer)
+            buffer = []
+    if buffer:
+        yield ''.join(buffer)
+
+@app.route('/import', methods=['GET', 'POST'])
+def import_contacts():
+    """Import contacts from an uploaded CSV or NDJSON file"""
+    form = ImportForm()
+    report = None
+    
+    if form.validate_on_submit():
+        upload = form.file.data
+        extension = os.path.splitext(upload.filename or '')[1].lower()
+        # The parser processes read from disk, so spool the upload to a temp file
+        fd, path = tempfile.mkstemp(suffix=extension)
+        try:
+            with os.fdopen(fd, 'wb') as spool:
+                upload.save(spool)
+            report = import_contacts_from_file(db, path, workers=app.config['IMPORT_WORKERS'])
+            flash(f'Imported {report["imported"]} of {report["processed"]} records', 
+                  'success' if not report['failed'] else 'warning')
+        except Exception as e:
+            flash(f'Error importing contacts: {str(e)}', 'error')
+        finally:
+            os.remove(path)
+    
+    return render_template('import_contacts.html', form=form, report=report)
 
 @app.route('/api/contacts')
+@conditional
 def api_contacts():
-    """JSON API endpoint for contacts"""
+    """JSON API endpoint for contacts
+    
+    Listings are paginated: pass ?limit=N and the returned next_cursor as
+    ?cursor= to fetch the following page. Search results are not paginated.
+    
+    ?stream=1 streams every contact as one JSON document instead, and
+    Accept: application/x-ndjson (or ?format=ndjson) streams one contact
+    per line; memory use is bounded by STREAM_CHUNK_SIZE either way.
+    """
     search_query = request.args.get('search', '')
     
+    wants_ndjson = (request.args.get('format') == 'ndjson' or
+                    request.accept_mimetypes.best_match(['application/json', 'application/x-ndjson']) == 'application/x-ndjson')
+    if wants_ndjson or request.args.get('stream', '').lower() in ('1', 'true', 'yes'):
+        if search_query:
+            contacts = db.search_contacts(search_query)
+        else:
+            contacts = db.iter_contacts(chunk_size=STREAM_CHUNK_SIZE)
+        
+        if wants_ndjson:
+            return Response(stream_contacts_ndjson(contacts), mimetype='application/x-ndjson')
+        return Response(stream_contacts_json(contacts), mimetype='application/json')
+    
     if search_query:
         contacts = db.search_contacts(search_query)
-    else:
-        contacts = db.get_all_contacts()
+        return jsonify({
+            'contacts': contacts,
+            'total': len(contacts)
+        })
+    
+    try:
+        limit = int(request.args.get('limit', API_PAGE_SIZE))
+    except ValueError:
+        return jsonify({'error': "'limit' must be an integer"}), 400
+    try:
+        after = decode_cursor(request.args.get('cursor', ''))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    limit = max(1, min(limit, API_MAX_PAGE_SIZE))
+    
+    contacts, next_cursor = db.list_contacts(after=after, limit=limit)
     
     return jsonify({
         'contacts': contacts,
-        'total': len(contacts)
+        'total': db.count_contacts(),
+        'next_cursor': encode_cursor(next_cursor)
     })
 
+@app.route('/api/contacts', methods=['POST'])
+def api_create_contacts():
+    """Create one contact from a JSON object, or many from a JSON array
+    
+    Arrays are validated up front and inserted with add_contacts_bulk in a
+    single transaction, so either every contact is created or none is.
+    """
+    payload = request.get_json(silent=True)
+    if payload is None:
+        return jsonify({'error': 'Expected a JSON object or array'}), 400
+    
+    if isinstance(payload, list):
+        if len(payload) > API_MAX_BULK_CONTACTS:
+            return jsonify({'error': f'At most {API_MAX_BULK_CONTACTS} contacts per request'}), 400
+        
+        contacts = []
+        errors = []
+        for index, item in enumerate(payload):
+            try:
+                contacts.append(parse_contact_json(item))
+            except ValueError as e:
+                errors.append({'index': index, 'error': str(e)})
+        if errors:
+            return jsonify({'error': 'Invalid contacts', 'errors': errors[:100]}), 400
+        
+        ids = db.add_contacts_bulk(contacts, batch_size=max(1, len(contacts)))
+        return jsonify({'ids': ids, 'count': len(ids)}), 201
+    
+    try:
+        contact = parse_contact_json(payload)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    contact_id = db.add_contact(**contact)
+    response = jsonify({'id': contact_id})
+    response.status_code = 201
+    response.headers['Location'] = url_for('api_contact', contact_id=contact_id)
+    return response
+
+@app.route('/api/contacts/<int:contact_id>', methods=['GET', 'PATCH', 'DELETE'])
+@conditional
+def api_contact(contact_id):
+    """Read, partially update or delete a single contact
+    
+    PATCH accepts any subset of the contact fields; include the "version"
+    you last read to get a 409 instead of overwriting a newer change.
+    """
+    if request.method == 'GET':
+        contact = db.get_contact_by_id(contact_id)
+        if not contact:
+            return jsonify({'error': 'Contact not found'}), 404
+        return jsonify(contact)
+    
+    if request.method == 'DELETE':
+        if not db.delete_contact(contact_id):
+            return jsonify({'error': 'Contact not found'}), 404
+        return '', 204
+    
+    payload = request.get_json(silent=True)
+    try:
+        changes = parse_contact_json(payload, partial=True)
+        expected_version = payload.get('version')
+        if expected_version is not None and (isinstance(expected_version, bool) or not isinstance(expected_version, int)):
+            raise ValueError("'version' must be an integer")
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    try:
+        success = db.update_contact(contact_id, expected_version=expected_version, **changes)
+    except ConcurrentUpdateError as e:
+        return jsonify({'error': str(e), 'current_version': e.current_version}), 409
+    
+    if not success:
+        return jsonify({'error': 'Contact not found'}), 404
+    return jsonify(db.get_contact_by_id(contact_id))
+
+@app.route('/api/contacts/bulk', methods=['POST'])
+def api_contacts_bulk():
+    """Apply one set-based operation to many contacts in a single transaction
+    
+    Body: {"action": ..., "ids": [...], ...} where action is one of
+    add_tag / remove_tag (with "tag"), rename_tag (with "tag", "new_tag" and
+    optional "ids"), merge_tags ("tag" into "new_tag", across all contacts;
+    "ids" is rejected) or delete. "ids" must be a JSON list of integers.
+    Returns the number of contacts affected.
+    """
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict):
+        return jsonify({'error': 'Expected a JSON object'}), 400
+    
+    action = payload.get('action')
+    ids = payload.get('ids')
+    try:
+        if ids is not None:
+            # bool is an int subclass, and strings or dicts would be iterated
+            if not isinstance(ids, list) or any(isinstance(contact_id, bool) or not isinstance(contact_id, int)
+                                                for contact_id in ids):
+                raise ValueError("'ids' must be a list of integer contact ids")
+            if action == 'merge_tags':
+                raise ValueError("'ids' is not accepted for merge_tags, which applies to all contacts")
+        elif action in ('add_tag', 'remove_tag', 'delete'):
+            raise ValueError(f"'ids' is required for {action}")
+        
+        if action == 'add_tag':
+            affected = db.add_tag_to_contacts(ids, payload.get('tag'))
+        elif action == 'remove_tag':
+            affected = db.remove_tag_from_contacts(ids, payload.get('tag'))
+        elif action == 'rename_tag':
+            affected = db.rename_tag(payload.get('tag'), payload.get('new_tag'), contact_ids=ids)
+        elif action == 'merge_tags':
+            affected = db.merge_tags(payload.get('tag'), payload.get('new_tag'))
+        elif action == 'delete':
+            affected = db.delete_contacts(ids)
+        else:
+            raise ValueError(f"Unknown action: {action!r}")
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return jsonify({'action': action, 'affected': affected})
+
+@app.route('/api/stats')
+@conditional
+def api_stats():
+    """JSON API endpoint for summary statistics"""
+    return jsonify(db.get_stats())
+
 @app.route('/api/tags')
+@conditional
 def api_tags():
     """JSON API endpoint for tags"""
-    all_tags = db.get_all_tags()
-    
-    # Count tag usage
-    contacts = db.get_all_contacts()
-    tag_counts = {}
-    for contact in contacts:
-        for tag in contact.get('tags', []):
-            tag_counts[tag] = tag_counts.get(tag, 0) + 1
-    
-    tags_with_counts = [{'tag': tag, 'count': tag_counts.get(tag, 0)} for tag in all_tags]
+    tags_with_counts = db.get_tag_counts()
     
     return jsonify({
         'tags': tags_with_counts,
-        'total': len(all_tags)
+        'total': len(tags_with_counts)
     })
 
 @app.template_filter('format_social_media')
+@timed_phase('filters')
 def format_social_media(social_media):
     """Template filter to format social media links"""
     if not social_media:
@@ -284,6 +1044,7 @@ def format_social_media(social_media):
     return ' '.join(formatted)
 
 @app.template_filter('format_tags')
+@timed_phase('filters')
 def format_tags(tags):
     """Template filter to format tags with colors"""
     if not tags:
@@ -298,6 +1059,21 @@ def format_tags(tags):
     
     return ' '.join(formatted_tags)
 
+@app.route('/metrics')
+def metrics():
+    """Prometheus text exposition of request, cache, pool and query metrics"""
+    return Response(metrics_registry.render(), content_type=METRICS_CONTENT_TYPE)
+
+@app.route('/debug/profiles')
+def debug_profiles():
+    """Recent request profiles with their top functions by cumulative time"""
+    if not profiler_authorized():
+        abort(404)
+    
+    top = max(1, min(request.args.get('top', 15, type=int), PROFILER_TOP_N))
+    return render_template('debug_profiles.html', profiles=list(reversed(_profiles)), top=top,
+                           max_profiles=PROFILER_MAX_PROFILES)
+
 if __name__ == '__main__':
     # Create templates directory if it doesn't exist
     os.makedirs('templates', exist_ok=True)
@@ -0,0 +1,5 @@
+"""
+Benchmarks for The People DB
+Run the full method suite with: python -m benchmarks [10k|100k|1m]
+Run individual benchmarks with: python -m benchmarks.<name>
+"""
@@ -0,0 +1,5 @@
+"""Run the benchmark suite: python -m benchmarks [10k|100k|1m|count] [--output results.json]"""
+
+from benchmarks.suite import main
+
+main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Bulk insert benchmark for The People DB
+Compares looping over add_contact with a single add_contacts_bulk call
+
+Usage: python -m benchmarks.bulk_insert [contacts] [batch_size]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+from database import ContactDatabase
+
+TAGS = ['friend', 'work', 'family', 'gym', 'school', 'neighbor', 'travel', 'music']
+
+def make_contacts(count: int) -> list:
+    """Build ``count`` contact dicts with a couple of tags each."""
+    rng = random.Random(7)
+    return [{
+        'name': f"Contact {i:07d}",
+        'nickname': f"nick{i}",
+        'birthday': f"19{rng.randint(50, 99)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        'personality_notes': "Imported by the bulk insert benchmark",
+        'social_media': {'twitter': f"@contact{i}"},
+        'tags': rng.sample(TAGS, 2),
+        'like_as_friend': rng.random() < 0.3
+    } for i in range(count)]
+
+def time_loop(db: ContactDatabase, contacts: list) -> float:
+    started = time.perf_counter()
+    for contact in contacts:
+        db.add_contact(**contact)
+    return time.perf_counter() - started
+
+def time_bulk(db: ContactDatabase, contacts: list, batch_size: int) -> float:
+    started = time.perf_counter()
+    db.add_contacts_bulk(contacts, batch_size=batch_size)
+    return time.perf_counter() - started
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    batch_size = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    contacts = make_contacts(count)
+    
+    print("=" * 60)
+    print(f"⏱️  Inserting {count} contacts (bulk batch size {batch_size})")
+    print("=" * 60)
+    
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, runner in (('add_contact loop', time_loop),
+                              ('add_contacts_bulk', lambda db, rows: time_bulk(db, rows, batch_size))):
+            db = ContactDatabase(os.path.join(tmp, f"{len(results)}.db"))
+            elapsed = runner(db, contacts)
+            assert db.count_contacts() == count
+            db.close()
+            results[label] = elapsed
+            print(f"{label:<20} {elapsed:>8.2f}s {count / elapsed:>12.0f} contacts/s")
+    
+    print("-" * 60)
+    print(f"📈 Speedup: {results['add_contact loop'] / results['add_contacts_bulk']:.1f}x")
+
+if __name__ == "__main__":
+    main()
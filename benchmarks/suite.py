@@ -0,0 +1,423 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark suite for The People DB
+Times every public ContactDatabase method against a synthetic address book
+and reports ops/sec and latency percentiles as JSON
+
+Each method is measured in three modes:
+  cold    a fresh ContactDatabase per call (empty read cache, new
+          connections, so SQLite's page and statement caches start empty)
+  warm    one long-lived instance with the read cache disabled, so every
+          call runs its SQL against warm SQLite caches
+  cached  one long-lived instance with the read cache enabled and primed
+
+The OS page cache is not dropped between cold calls, so "cold" measures a
+freshly opened database rather than a freshly booted machine.
+
+Usage: python -m benchmarks [10k|100k|1m|count] [--output results.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List
+
+from database import ContactDatabase
+from benchmarks import synthetic
+
+MODES = ('cold', 'warm', 'cached')
+
+# Calls per method and mode; heavy methods (full scans, exports) use fewer
+DEFAULT_ITERATIONS = 30
+HEAVY_ITERATIONS = 3
+
+# Distinct argument sets cycled through in cached mode, so lookups repeat
+CACHED_ARGUMENT_SETS = 8
+
+# Contacts touched by each bulk tag/delete call
+BULK_SIZE = 100
+
+# Lifecycle methods that cannot be timed in a loop
+NOT_BENCHMARKED = {'close'}
+
+SEARCH_TERMS = (synthetic.FIRST_NAMES[:10] + synthetic.LAST_NAMES[:10] +
+                ['hiking', 'coffee', 'marathon', 'guitar'])
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Linear-interpolated percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+def summarize(samples: List[float]) -> Dict:
+    """Turn per-call durations (seconds) into ops/sec and latency percentiles (ms)."""
+    ordered = sorted(samples)
+    total = sum(ordered)
+    return {
+        'iterations': len(ordered),
+        'ops_per_sec': len(ordered) / total if total else 0.0,
+        'latency_ms': {
+            'mean': total / len(ordered) * 1000 if ordered else 0.0,
+            'min': ordered[0] * 1000 if ordered else 0.0,
+            'p50': percentile(ordered, 50) * 1000,
+            'p90': percentile(ordered, 90) * 1000,
+            'p95': percentile(ordered, 95) * 1000,
+            'p99': percentile(ordered, 99) * 1000,
+            'max': ordered[-1] * 1000 if ordered else 0.0,
+        }
+    }
+
+def load_context(path: str, seed: int) -> Dict:
+    """Sample ids, keyset cursors and tags from the book for building call arguments."""
+    conn = sqlite3.connect(path)
+    try:
+        ids = [row[0] for row in conn.execute('SELECT id FROM contacts')]
+        rng = random.Random(seed)
+        cursors = [tuple(row) for row in conn.execute(
+            'SELECT name, id FROM contacts WHERE id IN (%s)' % ','.join('?' * min(200, len(ids))),
+            rng.sample(ids, min(200, len(ids)))
+        )]
+        # Weight tags by popularity, like real filter traffic
+        tag_counts = conn.execute('SELECT tag, count FROM tag_counts').fetchall()
+    finally:
+        conn.close()
+    
+    return {
+        'ids': ids,
+        'cursors': cursors,
+        'tags': [tag for tag, _ in tag_counts] or ['friend'],
+        'tag_weights': [count for _, count in tag_counts] or [1],
+        'next_index': len(ids),
+    }
+
+def new_contacts(context: Dict, rng: random.Random, count: int) -> List[Dict]:
+    contacts = [synthetic.make_contact(rng, context['next_index'] + i) for i in range(count)]
+    context['next_index'] += count
+    return contacts
+
+# Each case prepares one call: it may do untimed setup on ``db`` and returns
+# the zero-argument callable that is timed. Reads come before writes so the
+# read numbers are taken on the unmodified book.
+
+def case_get_all_contacts(db, context, rng):
+    return db.get_all_contacts
+
+def case_list_contacts(db, context, rng):
+    after = rng.choice(context['cursors']) if rng.random() < 0.8 else None
+    return lambda: db.list_contacts(after=after, limit=50)
+
+def case_iter_contacts(db, context, rng):
+    def consume():
+        for _ in db.iter_contacts():
+            pass
+    return consume
+
+def case_count_contacts(db, context, rng):
+    return db.count_contacts
+
+def case_get_contact_by_id(db, context, rng):
+    contact_id = rng.choice(context['ids'])
+    return lambda: db.get_contact_by_id(contact_id)
+
+def case_search_contacts(db, context, rng):
+    term = rng.choice(SEARCH_TERMS)
+    return lambda: db.search_contacts(term)
+
+def case_filter_by_tag(db, context, rng):
+    tag = rng.choices(context['tags'], weights=context['tag_weights'])[0]
+    return lambda: db.filter_by_tag(tag)
+
+def case_get_all_tags(db, context, rng):
+    return db.get_all_tags
+
+def case_get_tag_counts(db, context, rng):
+    return db.get_tag_counts
+
+def case_get_stats(db, context, rng):
+    return db.get_stats
+
+def case_check_tag_counts(db, context, rng):
+    return db.check_tag_counts
+
+def case_iter_csv(db, context, rng):
+    def consume():
+        for _ in db.iter_csv():
+            pass
+    return consume
+
+def case_export_to_csv(db, context, rng):
+    path = os.path.join(context['tmp_dir'], 'export.csv')
+    return lambda: db.export_to_csv(path)
+
+def case_changed_fields(db, context, rng):
+    contact = db.get_contact_by_id(rng.choice(context['ids']))
+    values = dict(contact, personality_notes='Changed by the benchmark', tags=contact['tags'] + ['bench'])
+    return lambda: db.changed_fields(contact, values)
+
+def case_data_version(db, context, rng):
+    return db.data_version
+
+def case_cache_stats(db, context, rng):
+    return db.cache_stats
+
+def case_init_database(db, context, rng):
+    return db.init_database
+
+def case_add_contact(db, context, rng):
+    contact = new_contacts(context, rng, 1)[0]
+    return lambda: db.add_contact(**contact)
+
+def case_add_contacts_bulk(db, context, rng):
+    contacts = new_contacts(context, rng, BULK_SIZE)
+    return lambda: db.add_contacts_bulk(contacts)
+
+def case_update_contact(db, context, rng):
+    contact_id = rng.choice(context['ids'])
+    notes = f"Updated by the benchmark ({rng.random():.6f})"
+    return lambda: db.update_contact(contact_id, personality_notes=notes)
+
+def case_add_tag_to_contacts(db, context, rng):
+    ids = rng.sample(context['ids'], min(BULK_SIZE, len(context['ids'])))
+    return lambda: db.add_tag_to_contacts(ids, 'bench')
+
+def case_remove_tag_from_contacts(db, context, rng):
+    ids = rng.sample(context['ids'], min(BULK_SIZE, len(context['ids'])))
+    db.add_tag_to_contacts(ids, 'bench')
+    return lambda: db.remove_tag_from_contacts(ids, 'bench')
+
+def case_rename_tag(db, context, rng):
+    ids = rng.sample(context['ids'], min(BULK_SIZE, len(context['ids'])))
+    db.add_tag_to_contacts(ids, 'bench-rename')
+    return lambda: db.rename_tag('bench-rename', 'bench-renamed', contact_ids=ids)
+
+def case_merge_tags(db, context, rng):
+    ids = rng.sample(context['ids'], min(BULK_SIZE, len(context['ids'])))
+    db.add_tag_to_contacts(ids, 'bench-merge')
+    return lambda: db.merge_tags('bench-merge', 'bench-merged')
+
+def case_rebuild_tag_counts(db, context, rng):
+    return db.rebuild_tag_counts
+
+def case_checkpoint(db, context, rng):
+    return lambda: db.checkpoint('PASSIVE')
+
+def case_delete_contact(db, context, rng):
+    contact_id = db.add_contact(**new_contacts(context, rng, 1)[0])
+    return lambda: db.delete_contact(contact_id)
+
+def case_delete_contacts(db, context, rng):
+    ids = db.add_contacts_bulk(new_contacts(context, rng, BULK_SIZE))
+    return lambda: db.delete_contacts(ids)
+
+# (method, prepare, heavy, read-only)
+CASES = [
+    ('get_all_contacts', case_get_all_contacts, True, True),
+    ('list_contacts', case_list_contacts, False, True),
+    ('iter_contacts', case_iter_contacts, True, True),
+    ('count_contacts', case_count_contacts, False, True),
+    ('get_contact_by_id', case_get_contact_by_id, False, True),
+    ('search_contacts', case_search_contacts, False, True),
+    ('filter_by_tag', case_filter_by_tag, False, True),
+    ('get_all_tags', case_get_all_tags, False, True),
+    ('get_tag_counts', case_get_tag_counts, False, True),
+    ('get_stats', case_get_stats, False, True),
+    ('check_tag_counts', case_check_tag_counts, True, True),
+    ('iter_csv', case_iter_csv, True, True),
+    ('export_to_csv', case_export_to_csv, True, True),
+    ('changed_fields', case_changed_fields, False, True),
+    ('data_version', case_data_version, False, True),
+    ('cache_stats', case_cache_stats, False, True),
+    ('init_database', case_init_database, False, False),
+    ('add_contact', case_add_contact, False, False),
+    ('add_contacts_bulk', case_add_contacts_bulk, False, False),
+    ('update_contact', case_update_contact, False, False),
+    ('add_tag_to_contacts', case_add_tag_to_contacts, False, False),
+    ('remove_tag_from_contacts', case_remove_tag_from_contacts, False, False),
+    ('rename_tag', case_rename_tag, False, False),
+    ('merge_tags', case_merge_tags, False, False),
+    ('rebuild_tag_counts', case_rebuild_tag_counts, True, False),
+    ('checkpoint', case_checkpoint, False, False),
+    ('delete_contact', case_delete_contact, False, False),
+    ('delete_contacts', case_delete_contacts, False, False),
+]
+
+def uncovered_methods() -> List[str]:
+    """Public ContactDatabase methods that have no benchmark case."""
+    public = {name for name in dir(ContactDatabase)
+              if not name.startswith('_') and callable(getattr(ContactDatabase, name))}
+    return sorted(public - {name for name, *_ in CASES} - NOT_BENCHMARKED)
+
+def time_calls(calls: List[Callable]) -> List[float]:
+    samples = []
+    for call in calls:
+        started = time.perf_counter()
+        call()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+def run_case(path: str, mode: str, prepare: Callable, read_only: bool, iterations: int,
+             context: Dict, rng: random.Random, profile: str) -> List[float]:
+    """Time ``iterations`` calls of one case in one mode; returns seconds per call."""
+    if mode == 'cold':
+        samples = []
+        for _ in range(iterations):
+            db = ContactDatabase(path, profile=profile)
+            try:
+                samples.extend(time_calls([prepare(db, context, rng)]))
+            finally:
+                db.close()
+        return samples
+    
+    db = context['dbs'][mode]
+    if mode == 'cached' and read_only:
+        # Prime a few argument sets, then cycle through them so calls hit the cache
+        calls = [prepare(db, context, rng) for _ in range(min(iterations, CACHED_ARGUMENT_SETS))]
+        for call in calls:
+            call()
+        return time_calls([calls[i % len(calls)] for i in range(iterations)])
+    
+    if read_only:
+        prepare(db, context, rng)()  # Warm-up call, not timed
+    
+    samples = []
+    for _ in range(iterations):
+        samples.extend(time_calls([prepare(db, context, rng)]))
+    return samples
+
+def prepare_book(size: str, seed: int, data_dir: str) -> str:
+    """Return the path of the synthetic book for ``size``, generating it once."""
+    count = synthetic.parse_size(size)
+    os.makedirs(data_dir, exist_ok=True)
+    path = os.path.join(data_dir, f"synthetic-{count}-{seed}.db")
+    if not os.path.exists(path):
+        print(f"🏗️  Generating {count} synthetic contacts into {path}...", file=sys.stderr)
+        building = path + '.building'
+        for leftover in (building, building + '-wal', building + '-shm'):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+        synthetic.build_database(building, count, seed=seed, progress=False).close()
+        os.replace(building, path)
+    return path
+
+def run_suite(size: str = '10k', modes=MODES, iterations: int = DEFAULT_ITERATIONS,
+              methods: List[str] = None, seed: int = 42, data_dir: str = None,
+              profile: str = 'concurrent') -> Dict:
+    """Run the benchmark cases and return the report dict.
+    
+    The synthetic book is generated once into ``data_dir`` and every run
+    works on a temporary copy, so write benchmarks never alter it.
+    """
+    for mode in modes:
+        if mode not in MODES:
+            raise ValueError(f"Unknown benchmark mode: {mode!r}")
+    cases = [case for case in CASES if not methods or case[0] in methods]
+    unknown = set(methods or ()) - {case[0] for case in CASES}
+    if unknown:
+        raise ValueError(f"No benchmark for: {', '.join(sorted(unknown))}")
+    
+    data_dir = data_dir or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+    book = prepare_book(size, seed, data_dir)
+    
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.db')
+        shutil.copyfile(book, path)
+        
+        context = load_context(path, seed)
+        context['tmp_dir'] = tmp
+        context['dbs'] = {
+            'warm': ContactDatabase(path, profile=profile, cache_size=0),
+            'cached': ContactDatabase(path, profile=profile),
+        }
+        rng = random.Random(seed)
+        
+        try:
+            for name, prepare, heavy, read_only in cases:
+                count = min(iterations, HEAVY_ITERATIONS) if heavy else iterations
+                for mode in modes:
+                    print(f"⏱️  {name:<26} {mode:<7}", end='', file=sys.stderr, flush=True)
+                    samples = run_case(path, mode, prepare, read_only, count, context, rng, profile)
+                    result = dict(method=name, mode=mode, **summarize(samples))
+                    results.append(result)
+                    print(f" {result['ops_per_sec']:>12.1f} ops/s  "
+                          f"p50 {result['latency_ms']['p50']:>9.3f} ms  "
+                          f"p99 {result['latency_ms']['p99']:>9.3f} ms", file=sys.stderr)
+            cache_stats = context['dbs']['cached'].cache_stats()
+        finally:
+            for db in context['dbs'].values():
+                db.close()
+    
+    return {
+        'meta': {
+            'book': os.path.basename(book),
+            'contacts': len(context['ids']),
+            'seed': seed,
+            'profile': profile,
+            'modes': list(modes),
+            'iterations': iterations,
+            'heavy_iterations': min(iterations, HEAVY_ITERATIONS),
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'platform': platform.platform(),
+            'started_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'not_benchmarked': uncovered_methods(),
+            'read_cache': cache_stats,
+        },
+        'results': results,
+    }
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks',
+                                     description='Benchmark every public ContactDatabase method.')
+    parser.add_argument('size', nargs='?', default='10k',
+                        help="book size: 10k, 100k, 1m or a contact count (default 10k)")
+    parser.add_argument('--output', '-o', help='write the JSON report here instead of stdout')
+    parser.add_argument('--iterations', '-n', type=int, default=DEFAULT_ITERATIONS,
+                        help=f'calls per method and mode (default {DEFAULT_ITERATIONS})')
+    parser.add_argument('--modes', default=','.join(MODES),
+                        help=f"comma-separated subset of {', '.join(MODES)}")
+    parser.add_argument('--methods', help='comma-separated method names to run (default: all)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--profile', default='concurrent', help='ContactDatabase performance profile')
+    parser.add_argument('--data-dir', help='where generated books are kept (default benchmarks/data)')
+    args = parser.parse_args(argv)
+    
+    missing = uncovered_methods()
+    if missing:
+        print(f"⚠️  No benchmark for: {', '.join(missing)}", file=sys.stderr)
+    
+    try:
+        report = run_suite(
+            size=args.size,
+            modes=[mode.strip() for mode in args.modes.split(',') if mode.strip()],
+            iterations=max(1, args.iterations),
+            methods=[name.strip() for name in args.methods.split(',')] if args.methods else None,
+            seed=args.seed,
+            data_dir=args.data_dir,
+            profile=args.profile,
+        )
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
+    
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+        print(f"✅ Results written to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Synthetic address books for The People DB benchmarks
+Generates realistic contacts (skewed tag popularity, notes of varying length,
+social media handles) and loads them with add_contacts_bulk
+
+Usage: python -m benchmarks.synthetic <10k|100k|1m|count> <output.db> [seed]
+"""
+
+import os
+import random
+import sys
+import time
+from typing import Dict, Iterator
+
+from database import ContactDatabase
+
+# Named book sizes accepted wherever a size is expected
+SIZES = {
+    '10k': 10_000,
+    '100k': 100_000,
+    '1m': 1_000_000,
+}
+
+FIRST_NAMES = [
+    'Aarav', 'Abigail', 'Ahmed', 'Aiko', 'Alejandro', 'Alice', 'Amara', 'Ana', 'Andrei', 'Anika',
+    'Ben', 'Bianca', 'Carlos', 'Chen', 'Chloe', 'Daniel', 'Dmitri', 'Elena', 'Emma', 'Fatima',
+    'Felix', 'Grace', 'Hannah', 'Hiroshi', 'Ibrahim', 'Isabel', 'Jack', 'Jamal', 'Jin', 'José',
+    'Julia', 'Kai', 'Karin', 'Leila', 'Liam', 'Lucas', 'Maya', 'Mei', 'Mohammed', 'Nadia',
+    'Noah', 'Olga', 'Omar', 'Priya', 'Rafael', 'Rosa', 'Sakura', 'Samuel', 'Sofia', 'Tariq',
+    'Thomas', 'Uma', 'Victor', 'Wei', 'Yara', 'Yusuf', 'Zara', 'Zoë', 'Émile', 'Łukasz',
+]
+
+LAST_NAMES = [
+    'Abe', 'Ahmadi', 'Andersen', 'Baker', 'Bauer', 'Costa', 'Das', 'Dubois', 'Eriksson', 'Fernández',
+    'García', 'Gupta', 'Haddad', 'Hansen', 'Ivanova', 'Jensen', 'Kim', 'Kowalski', 'Kumar', 'Lee',
+    'Li', 'López', 'Martin', 'Mendes', 'Müller', 'Nakamura', 'Nguyen', 'Novak', 'Okafor', 'Olsen',
+    'Patel', 'Petrov', 'Popescu', 'Rossi', 'Santos', 'Schmidt', 'Silva', 'Singh', 'Smith', 'Tanaka',
+    'Taylor', 'Tran', 'Wang', 'Weber', 'Williams', 'Wong', 'Yamamoto', 'Yilmaz', 'Zhang', 'Øvergaard',
+]
+
+CITIES = [
+    'Amsterdam, Netherlands', 'Austin, TX, USA', 'Bangalore, India', 'Berlin, Germany',
+    'Buenos Aires, Argentina', 'Cape Town, South Africa', 'Lagos, Nigeria', 'Lisbon, Portugal',
+    'London, UK', 'Melbourne, Australia', 'Mexico City, Mexico', 'Montréal, Canada',
+    'Osaka, Japan', 'Paris, France', 'Seoul, South Korea', 'São Paulo, Brazil',
+    'Singapore', 'Stockholm, Sweden', 'Toronto, Canada', 'Warsaw, Poland',
+]
+
+STREETS = ['Main St', 'Oak Avenue', 'Harbour Road', 'Station Lane', 'Park Street', 'Elm Way', 'Mill Road']
+
+# A few tags are very common and most are rare, as in real address books
+COMMON_TAGS = ['friend', 'work', 'family', 'school', 'gym', 'neighbor', 'travel', 'music']
+RARE_TAG_TOPICS = ['club', 'team', 'project', 'class', 'trip', 'band', 'league', 'course']
+
+NOTE_SENTENCES = [
+    'Met at a conference and kept in touch.',
+    'Loves hiking and always knows the best trails.',
+    'Great listener, gives thoughtful advice.',
+    'Allergic to peanuts; remember when planning dinners.',
+    'Plays guitar in a weekend band.',
+    'Always up for board games on Fridays.',
+    'Recently moved and is renovating an old house.',
+    'Training for a marathon this year.',
+    'Prefers messages over phone calls.',
+    'Introduced me to my current job.',
+    'Has two cats and strong opinions about coffee.',
+    'Speaks four languages and is learning a fifth.',
+    'Volunteers at the animal shelter on weekends.',
+    'Very organised; great person to plan trips with.',
+    'Collects vinyl records and vintage cameras.',
+]
+
+SOCIAL_PLATFORMS = ['twitter', 'instagram', 'linkedin', 'github', 'mastodon', 'facebook']
+
+def make_tags(rng: random.Random, rare_tags: int = 400) -> list:
+    """Pick 0-5 tags: mostly common ones, with a Zipf-like long tail."""
+    count = min(5, int(rng.expovariate(0.7)))
+    tags = []
+    for _ in range(count):
+        if rng.random() < 0.75:
+            # Earlier common tags are more popular
+            tag = COMMON_TAGS[min(int(rng.expovariate(0.45)), len(COMMON_TAGS) - 1)]
+        else:
+            rank = int(rng.paretovariate(1.1)) % rare_tags
+            tag = f"{RARE_TAG_TOPICS[rank % len(RARE_TAG_TOPICS)]}-{rank}"
+        if tag not in tags:
+            tags.append(tag)
+    return tags
+
+def make_contact(rng: random.Random, index: int) -> Dict:
+    """Build one realistic contact dict in add_contact's argument format."""
+    first = rng.choice(FIRST_NAMES)
+    last = rng.choice(LAST_NAMES)
+    handle = f"{first.lower()}{last.lower()}{index}"
+    
+    # Notes range from empty to a few paragraphs
+    sentences = min(int(rng.expovariate(0.35)), 20)
+    notes = ' '.join(rng.choice(NOTE_SENTENCES) for _ in range(sentences))
+    
+    return {
+        'name': f"{first} {last}",
+        'nickname': first[:3] if rng.random() < 0.3 else '',
+        'birthday': (f"{rng.randint(1940, 2010)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+                     if rng.random() < 0.8 else ''),
+        'address': (f"{rng.randint(1, 999)} {rng.choice(STREETS)}\n{rng.choice(CITIES)}"
+                    if rng.random() < 0.6 else ''),
+        'personality_notes': notes,
+        'social_media': {platform: f"@{handle}"
+                         for platform in rng.sample(SOCIAL_PLATFORMS, min(3, int(rng.expovariate(1.0))))},
+        'tags': make_tags(rng),
+        'like_as_friend': rng.random() < 0.4,
+        'like_romantically': rng.random() < 0.03,
+    }
+
+def generate_contacts(count: int, seed: int = 42) -> Iterator[Dict]:
+    """Yield ``count`` synthetic contacts; the same seed gives the same book."""
+    rng = random.Random(seed)
+    for index in range(count):
+        yield make_contact(rng, index)
+
+def parse_size(size) -> int:
+    """Turn '10k', '100k', '1m' or a plain number into a contact count."""
+    text = str(size).strip().lower()
+    if text in SIZES:
+        return SIZES[text]
+    try:
+        return int(text.replace('_', ''))
+    except ValueError:
+        raise ValueError(f"Unknown book size {size!r}; use {', '.join(SIZES)} or a number")
+
+def build_database(path: str, count: int, seed: int = 42, batch_size: int = 5000,
+                   progress: bool = True) -> ContactDatabase:
+    """Create ``path`` filled with ``count`` synthetic contacts and return it open."""
+    if os.path.exists(path):
+        raise FileExistsError(f"{path} already exists")
+    
+    db = ContactDatabase(path)
+    started = time.perf_counter()
+    batch = []
+    inserted = 0
+    for contact in generate_contacts(count, seed):
+        batch.append(contact)
+        if len(batch) >= batch_size:
+            inserted += len(db.add_contacts_bulk(batch, batch_size=batch_size))
+            batch = []
+            if progress:
+                print(f"\r⏳ {inserted}/{count} contacts", end='', flush=True)
+    if batch:
+        inserted += len(db.add_contacts_bulk(batch, batch_size=batch_size))
+    
+    db.checkpoint('TRUNCATE')
+    if progress:
+        print(f"\r✅ Generated {inserted} contacts in {time.perf_counter() - started:.1f}s")
+    return db
+
+def main():
+    if len(sys.argv) < 3:
+        print("Usage: python -m benchmarks.synthetic <10k|100k|1m|count> <output.db> [seed]")
+        sys.exit(1)
+    
+    count = parse_size(sys.argv[1])
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 42
+    try:
+        build_database(sys.argv[2], count, seed=seed).close()
+    except FileExistsError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
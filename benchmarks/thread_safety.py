@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Threaded write/read regression check for The People DB
+Runs threads that each mix writes (update_contact, add_tag_to_contacts,
+add_contacts_bulk) with reads of the cached getters on one ContactDatabase,
+then checks that no call failed and that the tag counts agree with contact_tags
+
+Usage: python -m benchmarks.thread_safety [seconds] [threads] [rounds]
+Exits with status 1 if any round saw an error.
+"""
+
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import traceback
+
+from database import ContactDatabase
+
+TAGS = ['friend', 'work', 'family', 'gym', 'school', 'neighbor', 'travel', 'music']
+
+def run_round(seconds: float, threads: int, seed: int) -> list:
+    """Run one mixed workload against a fresh database; returns the errors seen."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = ContactDatabase(os.path.join(tmp, 'threads.db'), pool_size=threads)
+        ids = db.add_contacts_bulk({'name': f"Contact {i:04d}", 'tags': [TAGS[i % len(TAGS)]]}
+                                   for i in range(500))
+        
+        stop = threading.Event()
+        errors = []
+        
+        def update(rng):
+            db.update_contact(rng.choice(ids), nickname=f"n{rng.randint(0, 999)}")
+        
+        def tag(rng):
+            db.add_tag_to_contacts(rng.sample(ids, 5), f"t{rng.randint(0, 20)}")
+        
+        def bulk(rng):
+            db.add_contacts_bulk([{'name': f"Bulk {rng.randint(0, 9999)}", 'tags': rng.sample(TAGS, 2)}
+                                  for _ in range(5)])
+        
+        def read(rng):
+            choice = rng.random()
+            if choice < 0.4:
+                db.get_contact_by_id(rng.choice(ids))
+            elif choice < 0.6:
+                db.list_contacts(limit=20)
+            elif choice < 0.8:
+                db.get_tag_counts()
+            else:
+                db.get_stats()
+        
+        # Every thread mixes writes with cached reads, mostly reads
+        operations = [update, tag, bulk] + [read] * 6
+        def worker(slot):
+            rng = random.Random(seed * 100 + slot)
+            while not stop.is_set():
+                try:
+                    rng.choice(operations)(rng)
+                except Exception:
+                    errors.append(traceback.format_exc(limit=3))
+                    return
+        
+        workers = [threading.Thread(target=worker, args=(slot,)) for slot in range(threads)]
+        for thread in workers:
+            thread.start()
+        time.sleep(seconds)
+        stop.set()
+        for thread in workers:
+            thread.join()
+        
+        drift = db.check_tag_counts()
+        if drift:
+            errors.append(f"Tag counts disagree with contact_tags: {drift[:5]}")
+        db.close()
+    return errors
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 2.0
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    rounds = int(sys.argv[3]) if len(sys.argv) > 3 else 10
+    
+    print(f"🧵 {rounds} rounds of {threads} threads for {seconds:g}s each")
+    failed = 0
+    for round_number in range(rounds):
+        errors = run_round(seconds, threads, round_number)
+        if errors:
+            failed += 1
+            print(f"❌ Round {round_number + 1}: {len(errors)} errors")
+            print(errors[0])
+        else:
+            print(f"✅ Round {round_number + 1}")
+    
+    if failed:
+        print(f"❌ {failed}/{rounds} rounds failed")
+        sys.exit(1)
+    print(f"✅ All {rounds} rounds passed")
+
+if __name__ == "__main__":
+    main()
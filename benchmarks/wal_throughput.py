@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Mixed read/write throughput benchmark for The People DB
+Compares the 'legacy' rollback-journal profile with the 'concurrent' WAL profile,
+with the read cache off so every read reaches SQLite
+
+Usage: python -m benchmarks.wal_throughput [seconds] [readers] [contacts]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+from database import ContactDatabase, PERFORMANCE_PROFILES
+
+TAGS = ['friend', 'work', 'family', 'gym', 'school', 'neighbor', 'travel', 'music']
+
+def seed_database(db: ContactDatabase, count: int) -> list:
+    """Insert ``count`` contacts in a single transaction and return their ids."""
+    rng = random.Random(42)
+    ids = []
+    with db.pool.connection():
+        for i in range(count):
+            ids.append(db.add_contact(
+                name=f"Contact {i:06d}",
+                nickname=f"nick{i}",
+                personality_notes="Seeded by the WAL throughput benchmark",
+                tags=rng.sample(TAGS, 2)
+            ))
+    return ids
+
+def run_profile(profile: str, seconds: float, readers: int, contacts: int) -> dict:
+    """Run readers and one writer concurrently against a fresh, uncached database."""
+    with tempfile.TemporaryDirectory() as tmp:
+        # cache_size=0: cached reads would measure memory, not the journal settings
+        db = ContactDatabase(os.path.join(tmp, 'bench.db'),
+                             pool_size=readers + 1, profile=profile, cache_size=0)
+        ids = seed_database(db, contacts)
+        
+        stop = threading.Event()
+        reads = [0] * readers
+        writes = [0]
+        errors = [0]
+        
+        def reader(slot):
+            rng = random.Random(slot)
+            while not stop.is_set():
+                try:
+                    if rng.random() < 0.8:
+                        db.get_contact_by_id(rng.choice(ids))
+                    else:
+                        db.search_contacts(f"Contact 00{rng.randint(0, 9)}")
+                    reads[slot] += 1
+                except Exception:
+                    errors[0] += 1
+        
+        def writer():
+            rng = random.Random(-1)
+            while not stop.is_set():
+                try:
+                    db.update_contact(rng.choice(ids), nickname=f"edited{rng.randint(0, 999)}")
+                    writes[0] += 1
+                except Exception:
+                    errors[0] += 1
+        
+        threads = [threading.Thread(target=reader, args=(slot,)) for slot in range(readers)]
+        threads.append(threading.Thread(target=writer))
+        
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        time.sleep(seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        
+        journal_mode = db.journal_mode
+        db.close()
+    
+    return {
+        'profile': profile,
+        'journal_mode': journal_mode,
+        'reads_per_sec': sum(reads) / elapsed,
+        'writes_per_sec': writes[0] / elapsed,
+        'errors': errors[0]
+    }
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5.0
+    readers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    contacts = int(sys.argv[3]) if len(sys.argv) > 3 else 2000
+    
+    print("=" * 70)
+    print(f"⏱️  Mixed read/write throughput: {readers} readers + 1 writer, "
+          f"{contacts} contacts, {seconds:g}s per profile, read cache off")
+    print("=" * 70)
+    print(f"{'Profile':<12} {'Journal':<10} {'Reads/s':>12} {'Writes/s':>12} {'Errors':>8}")
+    print("-" * 70)
+    
+    results = {}
+    for profile in PERFORMANCE_PROFILES:
+        result = run_profile(profile, seconds, readers, contacts)
+        results[profile] = result
+        print(f"{profile:<12} {result['journal_mode']:<10} {result['reads_per_sec']:>12.1f} "
+              f"{result['writes_per_sec']:>12.1f} {result['errors']:>8}")
+    
+    print("-" * 70)
+    before, after = results['legacy'], results['concurrent']
+    if before['reads_per_sec'] and before['writes_per_sec']:
+        print(f"📈 Reads: {after['reads_per_sec'] / before['reads_per_sec']:.2f}x | "
+              f"Writes: {after['writes_per_sec'] / before['writes_per_sec']:.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -5,10 +5,15 @@ This is a fallback interface that works without the textual library
 """
 
 import json
+import os
 import sys
-from database import ContactDatabase
+from database import ContactDatabase, ConcurrentUpdateError
+from importer import import_contacts, print_import_report
 
 class SimpleContactCLI:
+    # Contacts shown per page by "View All Contacts"
+    PAGE_SIZE = 20
+    
     def __init__(self):
         self.db = ContactDatabase()
     
@@ -24,7 +29,8 @@ class SimpleContactCLI:
         print("6. Filter by Tag")
         print("7. View All Tags")
         print("8. Export to CSV")
-        print("9. Quit")
+        print("9. Import from CSV/NDJSON")
+        print("10. Quit")
         print("="*50)
     
     def add_contact(self):
@@ -95,17 +101,28 @@ class SimpleContactCLI:
             print(f"❌ Error adding contact: {e}")
     
     def view_all_contacts(self):
-        contacts = self.db.get_all_contacts()
-        if not contacts:
+        total = self.db.count_contacts()
+        if not total:
             print("\n📭 No contacts found.")
             return
         
-        print(f"\n📋 ALL CONTACTS ({len(contacts)} total)")
+        print(f"\n📋 ALL CONTACTS ({total} total)")
         print("=" * 80)
         
-        for contact in contacts:
-            self.display_contact_summary(contact)
-            print("-" * 80)
+        shown = 0
+        after = None
+        while True:
+            contacts, after = self.db.list_contacts(after=after, limit=self.PAGE_SIZE)
+            for contact in contacts:
+                self.display_contact_summary(contact)
+                print("-" * 80)
+            shown += len(contacts)
+            
+            if after is None:
+                break
+            more = input(f"Showing {shown}/{total}. Press Enter for more or 'q' to stop: ").strip().lower()
+            if more == 'q':
+                break
     
     def display_contact_summary(self, contact):
         """Display a contact in a formatted way with color-coded tags."""
@@ -158,7 +175,7 @@ class SimpleContactCLI:
             print("💖 Relationship: ❌ Not interested")
     
     def search_contacts(self):
-        query = input("\n🔍 Enter search term (name, nickname, or tag): ").strip()
+        query = input("\n🔍 Enter search term (name, nickname, tag, address, or notes): ").strip()
         if not query:
             print("❌ Please enter a search term.")
             return
@@ -234,21 +251,28 @@ class SimpleContactCLI:
             like_romantically = romantic_input in ['y', 'yes', '1', 'true']
         
         try:
+            # Only write what changed, and refuse if the contact changed meanwhile
+            changes = self.db.changed_fields(contact, {
+                'name': name,
+                'nickname': nickname,
+                'birthday': birthday,
+                'address': address,
+                'personality_notes': personality_notes,
+                'tags': tags,
+                'like_as_friend': like_as_friend,
+                'like_romantically': like_romantically
+            })
             success = self.db.update_contact(
                 contact_id=contact_id,
-                name=name,
-                nickname=nickname,
-                birthday=birthday,
-                address=address,
-                personality_notes=personality_notes,
-                tags=tags,
-                like_as_friend=like_as_friend,
-                like_romantically=like_romantically
+                expected_version=contact.get('version'),
+                **changes
             )
             if success:
                 print(f"✅ Contact '{name}' updated successfully!")
             else:
                 print("❌ Failed to update contact.")
+        except ConcurrentUpdateError:
+            print("⚠️ This contact was changed elsewhere while you were editing. No changes were saved; please edit it again.")
         except Exception as e:
             print(f"❌ Error updating contact: {e}")
     
@@ -307,23 +331,16 @@ class SimpleContactCLI:
             print("-" * 80)
     
     def view_all_tags(self):
-        all_tags = self.db.get_all_tags()
-        if not all_tags:
+        tag_counts = self.db.get_tag_counts()
+        if not tag_counts:
             print("\n📭 No tags found.")
             return
         
-        # Count tag usage
-        contacts = self.db.get_all_contacts()
-        tag_counts = {}
-        for contact in contacts:
-            for tag in contact.get('tags', []):
-                tag_counts[tag] = tag_counts.get(tag, 0) + 1
-        
-        print(f"\n🏷️ ALL TAGS ({len(all_tags)} unique)")
+        print(f"\n🏷️ ALL TAGS ({len(tag_counts)} unique)")
         print("=" * 40)
         
-        for tag in sorted(all_tags):
-            count = tag_counts.get(tag, 0)
+        for entry in tag_counts:
+            tag, count = entry['tag'], entry['count']
             # Color-code tags
             colors = ['\033[91m', '\033[92m', '\033[93m', '\033[94m', '\033[95m', '\033[96m']
             reset = '\033[0m'
@@ -337,6 +354,30 @@ class SimpleContactCLI:
         except Exception as e:
             print(f"❌ Error exporting contacts: {e}")
     
+    def import_contacts(self):
+        print("\n📥 IMPORT CONTACTS")
+        print("Accepts CSV files in the export layout, or NDJSON with one contact per line")
+        path = input("File path: ").strip().strip('"')
+        if not path:
+            print("❌ Please enter a file path.")
+            return
+        if not os.path.exists(path):
+            print(f"❌ File '{path}' not found.")
+            return
+        
+        def show_progress(report):
+            print(f"\r⏳ {report['processed']} read, {report['imported']} imported, "
+                  f"{report['failed']} skipped", end='', flush=True)
+        
+        try:
+            report = import_contacts(self.db, path, progress=show_progress)
+        except Exception as e:
+            print(f"\n❌ Error importing contacts: {e}")
+            return
+        
+        print()
+        print_import_report(report)
+    
     def run(self):
         """Main application loop."""
         print("🚀 Starting The People DB...")
@@ -344,7 +385,7 @@ class SimpleContactCLI:
         while True:
             try:
                 self.display_menu()
-                choice = input("\nEnter your choice (1-9): ").strip()
+                choice = input("\nEnter your choice (1-10): ").strip()
                 
                 if choice == '1':
                     self.add_contact()
@@ -363,10 +404,12 @@ class SimpleContactCLI:
                 elif choice == '8':
                     self.export_to_csv()
                 elif choice == '9':
+                    self.import_contacts()
+                elif choice == '10':
                     print("\n👋 Goodbye!")
                     sys.exit(0)
                 else:
-                    print("❌ Invalid choice. Please enter 1-9.")
+                    print("❌ Invalid choice. Please enter 1-10.")
                 
                 input("\nPress Enter to continue...")
                 
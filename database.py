@@ -7,8 +7,18 @@ Handles all SQLite database operations for contact management
 import sqlite3
 import json
 import csv
-from datetime import datetime
-from typing import List, Dict, Optional
+import functools
+import io
+import operator
+import queue
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Callable, Iterable, Iterator, List, Dict, Optional, Tuple
 
 # Try to import pandas for enhanced CSV export, fall back to basic CSV if not available
 try:
@@ -17,16 +27,706 @@ try:
 except ImportError:
     PANDAS_AVAILABLE = False
 
+# Column layout of CSV exports (and of files accepted for import)
+CSV_FIELDS = [
+    'ID', 'Name', 'Nickname', 'Birthday', 'Address', 'Personality Notes', 'Social Media',
+    'Tags', 'Like as Friend', 'Like Romantically', 'Created At', 'Updated At'
+]
+
+# Contact dict keys in display order, with the value used when a column is missing
+CONTACT_COLUMNS = {
+    'id': None,
+    'name': '',
+    'nickname': '',
+    'birthday': '',
+    'address': '',
+    'personality_notes': '',
+    'social_media': None,
+    'tags': None,
+    'like_as_friend': False,
+    'like_romantically': False,
+    'created_at': '',
+    'updated_at': '',
+    'version': 1,
+}
+
+# Ids per "WHERE id IN (...)" statement, well under SQLite's bound-parameter limit
+ID_BATCH_SIZE = 500
+
+# Columns update_contact may set, in the order they appear in the UPDATE
+UPDATABLE_COLUMNS = [
+    'name', 'nickname', 'birthday', 'address', 'personality_notes',
+    'social_media', 'tags', 'like_as_friend', 'like_romantically'
+]
+
+# SQLite tuning presets selectable with ContactDatabase(profile=...)
+PERFORMANCE_PROFILES = {
+    # SQLite defaults: rollback journal, a write blocks every reader
+    'legacy': {
+        'journal_mode': None,
+        'pragmas': {},
+        'checkpoint_interval': None,
+    },
+    # WAL lets readers keep going while a single writer commits
+    'concurrent': {
+        'journal_mode': 'WAL',
+        'pragmas': {
+            'synchronous': 'NORMAL',      # fsync on checkpoint, not on every commit
+            'busy_timeout': 5000,         # ms to wait for a lock before failing
+            'cache_size': -20000,         # ~20 MB page cache per connection
+            'mmap_size': 268435456,       # 256 MB of memory-mapped reads
+        },
+        'checkpoint_interval': 60.0,      # seconds between passive checkpoints
+    },
+}
+
+# Upper bounds (ms) of the statement latency histogram buckets kept by QueryStats
+QUERY_TIME_BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+# Statements worth an EXPLAIN QUERY PLAN when they show up in the slow-query log
+EXPLAINABLE_STATEMENTS = ('SELECT', 'WITH', 'INSERT', 'UPDATE', 'DELETE', 'REPLACE')
+
+class ConnectionPool:
+    """Thread-safe pool of persistent SQLite connections.
+    
+    Connections are opened lazily up to ``size`` and reused, so SQLite's page
+    cache and prepared-statement cache survive between calls. A thread that
+    already holds a connection gets the same one back from nested
+    ``connection()`` blocks, and only the outermost block commits.
+    """
+    
+    def __init__(self, db_path: str, size: int = 5, statement_cache_size: int = 128,
+                 timeout: float = 30.0, pragmas: Dict = None, query_stats: 'QueryStats' = None):
+        # Every connection to ":memory:" is a separate database, so share one
+        if db_path == ':memory:':
+            size = 1
+        
+        self.db_path = db_path
+        self.size = max(1, size)
+        self.statement_cache_size = statement_cache_size
+        self.timeout = timeout
+        self.pragmas = pragmas or {}
+        self.query_stats = query_stats
+        
+        # Optional callback(phase, seconds) told how long each outermost block held a connection
+        self.phase_timer = None
+        
+        self._idle = queue.LifoQueue()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._all = []
+        self._closed = False
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open a new connection that may be handed between worker threads."""
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.timeout,
+            check_same_thread=False,
+            cached_statements=self.statement_cache_size,
+            # Plain connections unless timing was asked for, so it costs nothing when off
+            factory=InstrumentedConnection if self.query_stats else sqlite3.Connection
+        )
+        if self.query_stats:
+            conn.query_stats = self.query_stats
+        # Per-connection settings; values come from PERFORMANCE_PROFILES, not users
+        for pragma, value in self.pragmas.items():
+            conn.execute(f'PRAGMA {pragma} = {value}')
+        return conn
+    
+    def acquire(self) -> sqlite3.Connection:
+        """Check a connection out of the pool, opening one if there is room."""
+        if self._closed:
+            raise sqlite3.ProgrammingError("Connection pool is closed")
+        
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        
+        with self._lock:
+            if len(self._all) < self.size:
+                conn = self._connect()
+                self._all.append(conn)
+                return conn
+        
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise sqlite3.OperationalError(
+                f"Timed out waiting for a database connection (pool size {self.size})"
+            )
+    
+    def release(self, conn: sqlite3.Connection):
+        """Return a connection to the pool, discarding any open transaction."""
+        if conn.in_transaction:
+            conn.rollback()
+        
+        if self._closed:
+            conn.close()
+        else:
+            self._idle.put(conn)
+    
+    @contextmanager
+    def connection(self):
+        """Context manager yielding this thread's connection.
+        
+        The outermost block commits on success and rolls back on error.
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            # Nested use from the same thread shares the outer transaction
+            yield conn
+            return
+        
+        timer = self.phase_timer
+        started = time.perf_counter() if timer else None
+        conn = self.acquire()
+        self._local.conn = conn
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            self._local.conn = None
+            self.release(conn)
+            if timer:
+                timer('db', time.perf_counter() - started)
+    
+    def stats(self) -> Dict:
+        """Pool size with the number of open and checked-out connections."""
+        with self._lock:
+            opened = len(self._all)
+        return {'size': self.size, 'open': opened, 'in_use': max(0, opened - self._idle.qsize())}
+    
+    def current(self) -> Optional[sqlite3.Connection]:
+        """This thread's connection if it is inside a ``connection()`` block."""
+        return getattr(self._local, 'conn', None)
+    
+    @contextmanager
+    def checkout(self):
+        """Context manager for a connection kept apart from this thread's shared one.
+        
+        Meant for long-lived read cursors, such as streamed responses, so
+        other calls made while the stream is open don't join its snapshot.
+        """
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+    
+    def close(self):
+        """Close every idle connection; checked-out ones close on release."""
+        self._closed = True
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+        with self._lock:
+            self._all = []
+
+class ConcurrentUpdateError(Exception):
+    """Raised when a contact changed since the version an update was based on."""
+    
+    def __init__(self, contact_id: int, expected_version: int, current_version: int):
+        super().__init__(
+            f"Contact {contact_id} was modified by someone else "
+            f"(expected version {expected_version}, found {current_version})"
+        )
+        self.contact_id = contact_id
+        self.expected_version = expected_version
+        self.current_version = current_version
+
+class ReadCache:
+    """Size-bounded LRU cache of query results stamped with a data version.
+    
+    Entries are only valid for the version they were stored under; the first
+    lookup with a different version drops all of them.
+    """
+    
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        
+        self._entries = OrderedDict()
+        self._version = None
+        self._lock = threading.Lock()
+    
+    def get(self, key, version) -> Tuple[bool, object]:
+        """Return (found, value) for ``key`` as of ``version``."""
+        with self._lock:
+            if version != self._version:
+                if self._entries:
+                    self.invalidations += 1
+                    self._entries.clear()
+                self._version = version
+            
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, self._entries[key]
+            
+            self.misses += 1
+            return False, None
+    
+    def put(self, key, version, value):
+        """Store ``value`` unless the data has changed since ``version`` was read."""
+        with self._lock:
+            if version != self._version:
+                return
+            
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def clear(self):
+        """Drop every entry; statistics are kept."""
+        with self._lock:
+            self._entries.clear()
+            self._version = None
+    
+    def stats(self) -> Dict:
+        """Hit/miss/eviction counters and the current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries
+            }
+
+def _copy_result(value):
+    """Copy the dicts, lists and tuples of a query result; scalars are immutable."""
+    if isinstance(value, dict):
+        return {key: _copy_result(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy_result(item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(_copy_result(item) for item in value)
+    return value
+
+def _cached(method):
+    """Memoize a ContactDatabase read method until the data changes.
+    
+    Every caller gets its own copy of the cached result, so changing a
+    returned contact never changes what later reads see.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        conn = self.pool.current()
+        if not self.cache.max_entries or (conn is not None and conn.in_transaction):
+            # Uncommitted writes on this thread must not end up in the cache
+            return method(self, *args, **kwargs)
+        
+        key = (method.__name__, args, tuple(sorted(kwargs.items())))
+        version = self.data_version()
+        found, value = self.cache.get(key, version)
+        if not found:
+            value = method(self, *args, **kwargs)
+            self.cache.put(key, version, value)
+        return _copy_result(value)
+    
+    return wrapper
+
+class _QueryTimings:
+    """Latency histogram, totals and a rolling window of recent durations."""
+    
+    def __init__(self, window: int):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rows = 0
+        self.buckets = [0] * (len(QUERY_TIME_BUCKETS_MS) + 1)
+        self.recent = deque(maxlen=window)
+    
+    def add(self, duration_ms: float, rows: int):
+        self.count += 1
+        self.total += duration_ms
+        self.max = max(self.max, duration_ms)
+        self.rows += rows
+        self.recent.append(duration_ms)
+        for i, bound in enumerate(QUERY_TIME_BUCKETS_MS):
+            if duration_ms <= bound:
+                self.buckets[i] += 1
+                break
+        else:
+            self.buckets[-1] += 1
+    
+    def summary(self) -> Dict:
+        recent = sorted(self.recent)
+        
+        def pct(p):
+            return recent[min(len(recent) - 1, int(len(recent) * p / 100))] if recent else 0.0
+        
+        return {
+            'count': self.count,
+            'total_ms': self.total,
+            'mean_ms': self.total / self.count if self.count else 0.0,
+            'max_ms': self.max,
+            'p50_ms': pct(50),
+            'p95_ms': pct(95),
+            'p99_ms': pct(99),
+            'rows': self.rows,
+            # Per-bucket counts; the last bucket holds everything above the largest bound
+            'buckets': dict(zip([str(b) for b in QUERY_TIME_BUCKETS_MS] + ['+Inf'], self.buckets))
+        }
+
+class QueryStats:
+    """Timing of every SQL statement a ContactDatabase runs.
+    
+    Pass an instance as ``ContactDatabase(query_stats=...)`` to enable it.
+    Each statement is recorded with its duration (execute plus fetching),
+    row count and the public ContactDatabase method that issued it, in
+    per-statement and per-method histograms whose percentiles cover the
+    last ``window`` calls. Statements slower than ``slow_threshold_ms`` go
+    to a bounded slow-query log, appended to ``slow_log_path`` as JSON
+    lines when set, with their EXPLAIN QUERY PLAN if ``explain_slow``.
+    """
+    
+    def __init__(self, slow_threshold_ms: float = 100.0, explain_slow: bool = False,
+                 slow_log_path: str = None, slow_log_size: int = 100,
+                 window: int = 1000, max_statements: int = 500):
+        self.slow_threshold_ms = slow_threshold_ms
+        self.explain_slow = explain_slow
+        self.slow_log_path = slow_log_path
+        self.window = window
+        self.max_statements = max_statements
+        
+        self.statements = {}
+        self.methods = {}
+        self.slow_queries = deque(maxlen=slow_log_size)
+        self.slow_total = 0
+        self._normalized = {}
+        self._lock = threading.Lock()
+    
+    def _statement_key(self, sql: str) -> str:
+        """Collapse whitespace and "IN (?, ?, ...)" lists so variants share an entry."""
+        key = self._normalized.get(sql)
+        if key is None:
+            key = re.sub(r'\bIN \(\?(?:\s*,\s*\?)+\)', 'IN (?, ...)', ' '.join(sql.split()),
+                         flags=re.IGNORECASE)
+            if len(self._normalized) < self.max_statements * 4:
+                self._normalized[sql] = key
+        return key
+    
+    def record(self, conn: sqlite3.Connection, sql: str, parameters, method: str,
+               duration: float, rows: int):
+        """Add one finished statement; ``duration`` is in seconds."""
+        duration_ms = duration * 1000
+        key = self._statement_key(sql)
+        with self._lock:
+            if key not in self.statements and len(self.statements) >= self.max_statements:
+                key = '<other>'
+            timings = self.statements.get(key)
+            if timings is None:
+                timings = self.statements[key] = _QueryTimings(self.window)
+            timings.add(duration_ms, rows)
+            
+            timings = self.methods.get(method)
+            if timings is None:
+                timings = self.methods[method] = _QueryTimings(self.window)
+            timings.add(duration_ms, rows)
+        
+        if duration_ms >= self.slow_threshold_ms:
+            self._log_slow(conn, sql, key, parameters, method, duration_ms, rows)
+    
+    def _log_slow(self, conn, sql, key, parameters, method, duration_ms, rows):
+        entry = {
+            'time': datetime.now(timezone.utc).isoformat(timespec='milliseconds'),
+            'method': method,
+            'statement': key,
+            'duration_ms': round(duration_ms, 3),
+            'rows': rows,
+            'plan': None
+        }
+        if self.explain_slow and parameters is not None and key.upper().startswith(EXPLAINABLE_STATEMENTS):
+            try:
+                # A plain cursor, so the EXPLAIN itself is not recorded
+                plan = sqlite3.Cursor(conn).execute(f'EXPLAIN QUERY PLAN {sql}', parameters).fetchall()
+                entry['plan'] = [row[-1] for row in plan]
+            except sqlite3.Error as e:
+                entry['plan'] = [f"unavailable: {e}"]
+        
+        with self._lock:
+            self.slow_total += 1
+            self.slow_queries.append(entry)
+            if self.slow_log_path:
+                with open(self.slow_log_path, 'a', encoding='utf-8') as log_file:
+                    log_file.write(json.dumps(entry) + '\n')
+    
+    def snapshot(self) -> Dict:
+        """Per-statement and per-method summaries plus the slow-query log.
+        
+        Statements are sorted by total time, slowest first.
+        """
+        with self._lock:
+            statements = [dict(statement=key, **timings.summary()) for key, timings in self.statements.items()]
+            methods = {name: timings.summary() for name, timings in self.methods.items()}
+            slow = list(self.slow_queries)
+        
+        statements.sort(key=lambda entry: entry['total_ms'], reverse=True)
+        return {
+            'statements': statements,
+            'methods': methods,
+            'slow_queries': slow,
+            'slow_total': self.slow_total,
+            'slow_threshold_ms': self.slow_threshold_ms
+        }
+    
+    def reset(self):
+        """Forget all recorded timings and slow queries."""
+        with self._lock:
+            self.statements.clear()
+            self.methods.clear()
+            self.slow_queries.clear()
+            self.slow_total = 0
+
+def _calling_method() -> str:
+    """Name of the outermost ContactDatabase public method on the stack."""
+    frame = sys._getframe(2)
+    method = None
+    while frame is not None:
+        if frame.f_globals is globals():
+            name = frame.f_code.co_name
+            if not name.startswith('_') and name in _PUBLIC_METHODS:
+                method = name
+        elif method is not None:
+            break
+        frame = frame.f_back
+    return method or '<unknown>'
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Cursor that reports each statement to its connection's QueryStats.
+    
+    A statement is timed from execute() until its rows are exhausted, the
+    cursor runs another statement, or the cursor is closed or collected.
+    """
+    
+    _pending = None
+    
+    def _begin(self, sql, parameters, started):
+        self._pending = [sql, parameters, _calling_method(), time.perf_counter() - started, 0]
+    
+    def _finish(self):
+        pending, self._pending = self._pending, None
+        if pending is None:
+            return
+        sql, parameters, method, duration, fetched = pending
+        rows = fetched if self.description is not None else max(self.rowcount, 0)
+        self.connection.query_stats.record(self.connection, sql, parameters, method, duration, rows)
+    
+    def _fetched(self, started, count, exhausted):
+        if self._pending is not None:
+            self._pending[3] += time.perf_counter() - started
+            self._pending[4] += count
+            if exhausted:
+                self._finish()
+    
+    def execute(self, sql, parameters=()):
+        self._finish()
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._begin(sql, parameters, started)
+    
+    def executemany(self, sql, seq_of_parameters):
+        self._finish()
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            # Parameter sets may be a consumed iterator, so there is nothing to EXPLAIN with
+            self._begin(sql, None, started)
+    
+    def fetchone(self):
+        started = time.perf_counter()
+        row = super().fetchone()
+        self._fetched(started, row is not None, row is None)
+        return row
+    
+    def fetchmany(self, size=None):
+        size = self.arraysize if size is None else size
+        started = time.perf_counter()
+        rows = super().fetchmany(size)
+        self._fetched(started, len(rows), len(rows) < size)
+        return rows
+    
+    def fetchall(self):
+        started = time.perf_counter()
+        rows = super().fetchall()
+        self._fetched(started, len(rows), True)
+        return rows
+    
+    def __next__(self):
+        started = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._fetched(started, 0, True)
+            raise
+        self._fetched(started, 1, False)
+        return row
+    
+    def close(self):
+        self._finish()
+        super().close()
+    
+    def __del__(self):
+        try:
+            self._finish()
+        except Exception:
+            pass  # Connection already closed or interpreter shutting down
+
+class InstrumentedConnection(sqlite3.Connection):
+    """Connection whose cursors (including execute() shortcuts) are InstrumentedCursors."""
+    
+    query_stats = None
+    
+    def cursor(self, factory=None):
+        return super().cursor(factory or InstrumentedCursor)
+    
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+    
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
 class ContactDatabase:
-    def __init__(self, db_path: str = "contacts.db"):
+    def __init__(self, db_path: str = "contacts.db", pool_size: int = 5,
+                 statement_cache_size: int = 128, profile: str = "concurrent",
+                 cache_size: int = 256, query_stats: QueryStats = None):
+        if profile not in PERFORMANCE_PROFILES:
+            raise ValueError(f"Unknown performance profile: {profile!r}")
+        
         self.db_path = db_path
+        self.profile = profile
+        self.journal_mode = None
+        self.fts_enabled = False
+        self._decode_row = None
+        self._settings = PERFORMANCE_PROFILES[profile]
+        self._last_checkpoint = time.monotonic()
+        
+        # Statement timing and slow-query log; None leaves connections uninstrumented
+        self.query_stats = query_stats
+        self.pool = ConnectionPool(db_path, size=pool_size,
+                                   statement_cache_size=statement_cache_size,
+                                   pragmas=self._settings['pragmas'],
+                                   query_stats=query_stats)
+        
+        # Read results are cached per data version; cache_size=0 disables it
+        self.cache = ReadCache(cache_size)
+        self._write_count = 0
+        self._external_changes = 0
+        self._seen_versions = {}    # pooled connection -> its last PRAGMA data_version
+        self._version_lock = threading.Lock()
+        
         self.init_database()
     
+    def close(self):
+        """Close all pooled database connections."""
+        self.pool.close()
+        with self._version_lock:
+            self._seen_versions.clear()
+    
     def init_database(self):
         """Initialize the SQLite database with the contacts table."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            
+            # journal_mode is stored in the file, so it only needs setting once
+            if self._settings['journal_mode']:
+                cursor.execute(f"PRAGMA journal_mode = {self._settings['journal_mode']}")
+            cursor.execute('PRAGMA journal_mode')
+            self.journal_mode = cursor.fetchone()[0].lower()
+            
+            self._create_schema(cursor)
+    
+    @contextmanager
+    def _write_connection(self):
+        """Pooled connection for a write, followed by post-commit housekeeping."""
+        with self.pool.connection() as conn:
+            yield conn
+        self._after_write()
+    
+    def _after_write(self):
+        """Run periodic maintenance once a write has been committed."""
+        with self._version_lock:
+            self._write_count += 1
+        
+        interval = self._settings['checkpoint_interval']
+        if not interval or self.journal_mode != 'wal':
+            return
         
+        now = time.monotonic()
+        if now - self._last_checkpoint >= interval:
+            self._last_checkpoint = now
+            self.checkpoint()
+    
+    def data_version(self) -> int:
+        """Number that changes whenever committed contact data may have changed.
+        
+        Combines a counter of this instance's writes with a counter of
+        changes seen through ``PRAGMA data_version``, so commits from other
+        processes (CLI, repair_db.py) are noticed too. The pragma is read on
+        the caller's pooled connection; its value only means something to
+        that connection, so each connection's last value is remembered and
+        any difference (or a connection not seen before) counts as a change.
+        """
+        if self.db_path == ':memory:':
+            with self._version_lock:
+                return self._write_count
+        
+        with self.pool.connection() as conn:
+            # A plain cursor, so the poll is not recorded by query_stats
+            pragma = sqlite3.Cursor(conn).execute('PRAGMA data_version').fetchone()[0]
+            with self._version_lock:
+                if self._seen_versions.get(conn) != pragma:
+                    self._seen_versions[conn] = pragma
+                    self._external_changes += 1
+                return self._write_count + self._external_changes
+    
+    def cache_stats(self) -> Dict:
+        """Hit/miss/eviction statistics of the read cache."""
+        return self.cache.stats()
+    
+    def checkpoint(self, mode: str = "PASSIVE") -> Dict:
+        """Copy WAL frames back into the database file.
+        
+        PASSIVE never blocks readers or writers; FULL, RESTART and TRUNCATE
+        wait for them as described in the SQLite documentation.
+        """
+        mode = mode.upper()
+        if mode not in ('PASSIVE', 'FULL', 'RESTART', 'TRUNCATE'):
+            raise ValueError(f"Unknown checkpoint mode: {mode!r}")
+        
+        with self.pool.connection() as conn:
+            busy, log_frames, checkpointed = conn.execute(
+                f'PRAGMA wal_checkpoint({mode})'
+            ).fetchone()
+        
+        return {
+            'busy': bool(busy),
+            'log_frames': log_frames,
+            'checkpointed_frames': checkpointed
+        }
+    
+    def _create_schema(self, cursor: sqlite3.Cursor):
+        """Create the contacts table and apply in-place column migrations."""
         # Create the main contacts table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS contacts (
@@ -41,7 +741,8 @@ class ContactDatabase:
                 like_as_friend BOOLEAN DEFAULT 0,
                 like_romantically BOOLEAN DEFAULT 0,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                version INTEGER NOT NULL DEFAULT 1
             )
         ''')
         
@@ -64,293 +765,728 @@ class ContactDatabase:
             cursor.execute('ALTER TABLE contacts ADD COLUMN like_romantically BOOLEAN DEFAULT 0')
             print("✅ Added 'like_romantically' column to existing database")
         
-        conn.commit()
-        conn.close()
+        # Add version column (bumped on every update) if it doesn't exist
+        if 'version' not in columns:
+            cursor.execute('ALTER TABLE contacts ADD COLUMN version INTEGER NOT NULL DEFAULT 1')
+            print("✅ Added 'version' column to existing database")
+        
+        # Supports ORDER BY name and keyset pagination on (name, id)
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_contacts_name_id ON contacts (name, id)')
+        
+        # Small indexes that let get_stats() count without scanning the table
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_contacts_created_at ON contacts (created_at)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_contacts_friends ON contacts (id) WHERE like_as_friend = 1')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_contacts_romantic ON contacts (id) WHERE like_romantically = 1')
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_contacts_no_birthday ON contacts (id) WHERE birthday IS NULL OR birthday = ''")
+        
+        # Normalized copy of contacts.tags so tag lookups can use an index
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'contact_tags'")
+        needs_tag_backfill = cursor.fetchone() is None
+        
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS contact_tags (
+                contact_id INTEGER NOT NULL,
+                tag TEXT NOT NULL,
+                PRIMARY KEY (contact_id, tag)
+            ) WITHOUT ROWID
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_contact_tags_tag ON contact_tags (tag COLLATE NOCASE)')
+        
+        if needs_tag_backfill:
+            self._backfill_contact_tags(cursor)
+        
+        self._create_tag_counts(cursor)
+        self.fts_enabled = self._create_search_index(cursor)
+        
+        # Every read selects contacts.*, so the column layout is fixed from here on
+        cursor.execute('SELECT * FROM contacts LIMIT 0')
+        self._decode_row = self._compile_row_decoder([column[0] for column in cursor.description])
+    
+    @staticmethod
+    def _compile_row_decoder(columns: List[str]) -> Callable[[tuple], Dict]:
+        """Build a function turning ``SELECT * FROM contacts`` rows into contact dicts.
+        
+        Columns are matched by name, so databases whose columns were added by
+        ALTER TABLE decode the same as fresh ones. Columns not listed in
+        CONTACT_COLUMNS are passed through unchanged.
+        """
+        positions = {name: index for index, name in enumerate(columns)}
+        keys = [key for key in CONTACT_COLUMNS if key in positions]
+        keys += [name for name in columns if name not in CONTACT_COLUMNS]
+        pick = operator.itemgetter(*[positions[key] for key in keys])
+        missing = {key: default for key, default in CONTACT_COLUMNS.items() if key not in positions}
+        
+        def load_json(value, expected_type):
+            # Safe JSON parsing with error handling
+            try:
+                decoded = json.loads(value) if value else None
+            except (json.JSONDecodeError, TypeError):
+                decoded = None
+            return decoded if isinstance(decoded, expected_type) else expected_type()
+        
+        def decode(row) -> Dict:
+            contact = dict(zip(keys, pick(row)))
+            if missing:
+                contact.update(missing)
+            contact['social_media'] = load_json(contact['social_media'], dict)
+            contact['tags'] = load_json(contact['tags'], list)
+            contact['like_as_friend'] = bool(contact['like_as_friend'])
+            contact['like_romantically'] = bool(contact['like_romantically'])
+            return contact
+        
+        return decode
+    
+    def _create_tag_counts(self, cursor: sqlite3.Cursor):
+        """Create the tag_counts summary table and the triggers that maintain it.
+        
+        Every change to a contact's tags goes through contact_tags, so
+        triggers there keep one row per tag with its number of contacts.
+        """
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS tag_counts (
+                tag TEXT PRIMARY KEY,
+                count INTEGER NOT NULL
+            ) WITHOUT ROWID
+        ''')
+        
+        # A missing trigger means the table is new or missed writes, so rebuild it
+        cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'tag_counts_%'")
+        needs_rebuild = cursor.fetchone()[0] < 2
+        
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS tag_counts_insert AFTER INSERT ON contact_tags BEGIN
+                INSERT INTO tag_counts (tag, count) VALUES (new.tag, 1)
+                ON CONFLICT (tag) DO UPDATE SET count = count + 1;
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS tag_counts_delete AFTER DELETE ON contact_tags BEGIN
+                UPDATE tag_counts SET count = count - 1 WHERE tag = old.tag;
+                DELETE FROM tag_counts WHERE tag = old.tag AND count <= 0;
+            END
+        ''')
+        
+        if needs_rebuild:
+            self._rebuild_tag_counts(cursor)
+    
+    @staticmethod
+    def _rebuild_tag_counts(cursor: sqlite3.Cursor) -> int:
+        """Recompute tag_counts from contact_tags; returns the number of tags."""
+        cursor.execute('DELETE FROM tag_counts')
+        cursor.execute('INSERT INTO tag_counts (tag, count) SELECT tag, COUNT(*) FROM contact_tags GROUP BY tag')
+        return cursor.rowcount
+    
+    def rebuild_tag_counts(self) -> int:
+        """Recompute the tag_counts summary table from scratch.
+        
+        Only needed for recovery, e.g. after contact_tags was edited with
+        the triggers missing. Returns the number of distinct tags.
+        """
+        with self._write_connection() as conn:
+            return self._rebuild_tag_counts(conn.cursor())
+    
+    def check_tag_counts(self) -> List[Dict]:
+        """Compare tag_counts against contact_tags.
+        
+        Returns one {'tag', 'expected', 'actual'} entry per mismatch, where
+        'actual' is None for a tag missing from tag_counts; an empty list
+        means the summary table is consistent.
+        """
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT expected.tag, expected.count, tag_counts.count
+                FROM (SELECT tag, COUNT(*) AS count FROM contact_tags GROUP BY tag) AS expected
+                LEFT JOIN tag_counts ON tag_counts.tag = expected.tag
+                WHERE tag_counts.count IS NOT expected.count
+                UNION ALL
+                SELECT tag, 0, count FROM tag_counts
+                WHERE tag NOT IN (SELECT tag FROM contact_tags)
+                ORDER BY 1
+            ''')
+            return [{'tag': tag, 'expected': expected, 'actual': actual}
+                    for tag, expected, actual in cursor.fetchall()]
+    
+    def _create_search_index(self, cursor: sqlite3.Cursor) -> bool:
+        """Create the FTS5 search index and the triggers that keep it current.
+        
+        Returns False when SQLite was built without FTS5, in which case
+        search_contacts falls back to LIKE queries.
+        """
+        try:
+            cursor.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS contacts_fts USING fts5(
+                    name, nickname, tags, address, personality_notes,
+                    content='contacts', content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+                )
+            ''')
+        except sqlite3.OperationalError:
+            # No FTS5 module: drop triggers left by a build that had it, or writes would fail
+            for trigger in ('contacts_fts_insert', 'contacts_fts_delete', 'contacts_fts_update'):
+                cursor.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+            return False
+        
+        # A missing trigger means the index is new or missed writes, so rebuild it
+        cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'contacts_fts_%'")
+        needs_rebuild = cursor.fetchone()[0] < 3
+        
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS contacts_fts_insert AFTER INSERT ON contacts BEGIN
+                INSERT INTO contacts_fts (rowid, name, nickname, tags, address, personality_notes)
+                VALUES (new.id, new.name, new.nickname, new.tags, new.address, new.personality_notes);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS contacts_fts_delete AFTER DELETE ON contacts BEGIN
+                INSERT INTO contacts_fts (contacts_fts, rowid, name, nickname, tags, address, personality_notes)
+                VALUES ('delete', old.id, old.name, old.nickname, old.tags, old.address, old.personality_notes);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS contacts_fts_update
+            AFTER UPDATE OF name, nickname, tags, address, personality_notes ON contacts BEGIN
+                INSERT INTO contacts_fts (contacts_fts, rowid, name, nickname, tags, address, personality_notes)
+                VALUES ('delete', old.id, old.name, old.nickname, old.tags, old.address, old.personality_notes);
+                INSERT INTO contacts_fts (rowid, name, nickname, tags, address, personality_notes)
+                VALUES (new.id, new.name, new.nickname, new.tags, new.address, new.personality_notes);
+            END
+        ''')
+        
+        if needs_rebuild:
+            cursor.execute("INSERT INTO contacts_fts (contacts_fts) VALUES ('rebuild')")
+            cursor.execute('SELECT EXISTS (SELECT 1 FROM contacts)')
+            if cursor.fetchone()[0]:
+                print("✅ Built full-text search index 'contacts_fts'")
+        
+        return True
+    
+    def _backfill_contact_tags(self, cursor: sqlite3.Cursor):
+        """Populate contact_tags from the JSON tags column of existing contacts."""
+        cursor.execute('SELECT id, tags FROM contacts')
+        tag_rows = []
+        for contact_id, tags_json in cursor.fetchall():
+            tag_rows.extend(self._tag_rows(contact_id, self._parse_tags(tags_json)))
+        
+        cursor.executemany('INSERT OR IGNORE INTO contact_tags (contact_id, tag) VALUES (?, ?)', tag_rows)
+        if tag_rows:
+            print(f"✅ Indexed {len(tag_rows)} existing tags into 'contact_tags'")
+    
+    @staticmethod
+    def _parse_tags(tags_json) -> List[str]:
+        """Decode a tags JSON value, treating anything but a list as empty."""
+        try:
+            tags = json.loads(tags_json) if tags_json else []
+        except (json.JSONDecodeError, TypeError):
+            return []
+        return tags if isinstance(tags, list) else []
+    
+    @staticmethod
+    def _tag_rows(contact_id: int, tags: List[str]) -> List[tuple]:
+        """Build contact_tags rows for one contact, skipping empty tags."""
+        return [(contact_id, str(tag)) for tag in tags if tag not in (None, '')]
+    
+    def _sync_tags(self, cursor: sqlite3.Cursor, contact_id: int, tags: List[str]):
+        """Replace the contact_tags rows of one contact."""
+        cursor.execute('DELETE FROM contact_tags WHERE contact_id = ?', (contact_id,))
+        cursor.executemany('INSERT OR IGNORE INTO contact_tags (contact_id, tag) VALUES (?, ?)',
+                           self._tag_rows(contact_id, tags))
     
     def add_contact(self, name: str, nickname: str = "", birthday: str = "", 
                    address: str = "", personality_notes: str = "", social_media: dict = None, 
                    tags: List[str] = None, like_as_friend: bool = False,
                    like_romantically: bool = False) -> int:
         """Add a new contact to the database."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
         social_media_json = json.dumps(social_media or {})
         tags_json = json.dumps(tags or [])
         
-        cursor.execute('''
-            INSERT INTO contacts (name, nickname, birthday, address, personality_notes, social_media, tags, like_as_friend, like_romantically)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (name, nickname, birthday, address, personality_notes, social_media_json, tags_json, like_as_friend, like_romantically))
-        
-        contact_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        with self._write_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT INTO contacts (name, nickname, birthday, address, personality_notes, social_media, tags, like_as_friend, like_romantically)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (name, nickname, birthday, address, personality_notes, social_media_json, tags_json, like_as_friend, like_romantically))
+            
+            contact_id = cursor.lastrowid
+            self._sync_tags(cursor, contact_id, tags or [])
         
         return contact_id
     
-    def get_all_contacts(self) -> List[Dict]:
-        """Retrieve all contacts from the database."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT * FROM contacts ORDER BY name')
-        rows = cursor.fetchall()
+    @property
+    def phase_timer(self) -> Optional[Callable[[str, float], None]]:
+        """Callback(phase, seconds) for per-request timing breakdowns, or None.
         
-        contacts = []
-        for row in rows:
-            # Safe JSON parsing with error handling
-            try:
-                social_media = json.loads(row[6]) if len(row) > 6 and row[6] else {}
-            except (json.JSONDecodeError, TypeError):
-                social_media = {}
-            
-            try:
-                tags = json.loads(row[7]) if len(row) > 7 and row[7] else []
-            except (json.JSONDecodeError, TypeError):
-                tags = []
-            
-            contact = {
-                'id': row[0],
-                'name': row[1],
-                'nickname': row[2],
-                'birthday': row[3],
-                'address': row[4] if len(row) > 4 else '',
-                'personality_notes': row[5] if len(row) > 5 else '',
-                'social_media': social_media,
-                'tags': tags,
-                'like_as_friend': bool(row[8]) if len(row) > 8 else False,
-                'like_romantically': bool(row[9]) if len(row) > 9 else False,
-                'created_at': row[10] if len(row) > 10 else '',
-                'updated_at': row[11] if len(row) > 11 else ''
-            }
-            contacts.append(contact)
+        It is called with 'db' for the time each outermost pooled-connection
+        block took (acquire, SQL and commit) and with 'decode' for turning
+        rows into contact dicts. Calls come from the thread doing the work.
+        """
+        return self.pool.phase_timer
+    
+    @phase_timer.setter
+    def phase_timer(self, callback: Optional[Callable[[str, float], None]]):
+        self.pool.phase_timer = callback
+    
+    def _rows_to_contacts(self, rows: List[tuple]) -> List[Dict]:
+        """Convert ``SELECT * FROM contacts`` rows into contact dictionaries."""
+        timer = self.pool.phase_timer
+        if timer is None:
+            return [self._decode_row(row) for row in rows]
         
-        conn.close()
+        started = time.perf_counter()
+        contacts = [self._decode_row(row) for row in rows]
+        timer('decode', time.perf_counter() - started)
         return contacts
     
-    def get_contact_by_id(self, contact_id: int) -> Optional[Dict]:
-        """Get a specific contact by ID."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    def _query_contacts(self, sql: str, params: tuple = ()) -> List[Dict]:
+        """Run a ``SELECT contacts.*`` query and decode the resulting rows."""
+        with self.pool.connection() as conn:
+            rows = conn.execute(sql, params).fetchall()
         
-        cursor.execute('SELECT * FROM contacts WHERE id = ?', (contact_id,))
-        row = cursor.fetchone()
+        return self._rows_to_contacts(rows)
+    
+    def add_contacts_bulk(self, contacts: Iterable[Dict], batch_size: int = 1000) -> List[int]:
+        """Add many contacts, one executemany() and one commit per batch.
         
-        if row:
-            # Get column names to handle different schema versions
-            cursor.execute("PRAGMA table_info(contacts)")
-            columns = [column[1] for column in cursor.fetchall()]
-            
-            # Safe JSON parsing with error handling
-            try:
-                social_media = json.loads(row[5]) if row[5] else {}
-            except (json.JSONDecodeError, TypeError):
-                social_media = {}
-            
-            try:
-                tags = json.loads(row[6]) if row[6] else []
-            except (json.JSONDecodeError, TypeError):
-                tags = []
-            
-            contact = {
-                'id': row[0],
-                'name': row[1],
-                'nickname': row[2],
-                'birthday': row[3],
-                'personality_notes': row[4],
-                'social_media': social_media,
-                'tags': tags,
-            }
-            
-            # Handle address field with backward compatibility
-            if 'address' in columns:
-                address_index = columns.index('address')
-                contact['address'] = row[address_index] if len(row) > address_index else ''
-            else:
-                contact['address'] = ''
-            
-            # Handle new columns with backward compatibility
-            if 'like_as_friend' in columns:
-                friend_index = columns.index('like_as_friend')
-                contact['like_as_friend'] = bool(row[friend_index]) if len(row) > friend_index else False
-            else:
-                contact['like_as_friend'] = False
-                
-            if 'like_romantically' in columns:
-                romantic_index = columns.index('like_romantically')
-                contact['like_romantically'] = bool(row[romantic_index]) if len(row) > romantic_index else False
-            else:
-                contact['like_romantically'] = False
+        Each item is a dict using add_contact's argument names; only 'name'
+        is required. Returns the new ids in input order. Tags and the search
+        index are kept consistent exactly as with add_contact. If a batch
+        fails it is rolled back, and earlier batches stay committed.
+        """
+        ids = []
+        batch = []
+        for contact in contacts:
+            batch.append(contact)
+            if len(batch) >= batch_size:
+                ids.extend(self._insert_batch(batch))
+                batch = []
+        if batch:
+            ids.extend(self._insert_batch(batch))
+        
+        return ids
+    
+    def _insert_batch(self, contacts: List[Dict]) -> List[int]:
+        """Insert one batch of contacts in a single transaction."""
+        rows = [(
+            contact['name'],
+            contact.get('nickname', ''),
+            contact.get('birthday', ''),
+            contact.get('address', ''),
+            contact.get('personality_notes', ''),
+            json.dumps(contact.get('social_media') or {}),
+            json.dumps(contact.get('tags') or []),
+            bool(contact.get('like_as_friend', False)),
+            bool(contact.get('like_romantically', False))
+        ) for contact in contacts]
+        
+        with self._write_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany('''
+                INSERT INTO contacts (name, nickname, birthday, address, personality_notes, social_media, tags, like_as_friend, like_romantically)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', rows)
             
-            # Handle created_at and updated_at with backward compatibility
-            if 'created_at' in columns:
-                created_index = columns.index('created_at')
-                contact['created_at'] = row[created_index] if len(row) > created_index else ''
-            else:
-                contact['created_at'] = ''
-                
-            if 'updated_at' in columns:
-                updated_index = columns.index('updated_at')
-                contact['updated_at'] = row[updated_index] if len(row) > updated_index else ''
-            else:
-                contact['updated_at'] = ''
+            # The write lock is held since the first INSERT, so the batch got consecutive ids
+            cursor.execute('SELECT last_insert_rowid()')
+            last_id = cursor.fetchone()[0]
+            ids = list(range(last_id - len(rows) + 1, last_id + 1))
             
-            conn.close()
-            return contact
+            tag_rows = []
+            for contact_id, contact in zip(ids, contacts):
+                tag_rows.extend(self._tag_rows(contact_id, contact.get('tags') or []))
+            cursor.executemany('INSERT OR IGNORE INTO contact_tags (contact_id, tag) VALUES (?, ?)', tag_rows)
+        
+        return ids
+    
+    @_cached
+    def get_all_contacts(self) -> List[Dict]:
+        """Retrieve all contacts from the database."""
+        return self._query_contacts('SELECT * FROM contacts ORDER BY name')
+    
+    @_cached
+    def list_contacts(self, after: Optional[Tuple[str, int]] = None, limit: int = 50,
+                      until: Optional[Tuple[str, int]] = None) -> Tuple[List[Dict], Optional[Tuple[str, int]]]:
+        """Get one page of contacts ordered by name, using keyset pagination.
+        
+        ``after`` is the (name, id) cursor returned with the previous page.
+        ``until`` optionally ends the page before that (name, id) key, for
+        re-reading a page that precedes rows a caller already holds.
+        Returns the page and the cursor for the next one, or None on the
+        last page. Each page is an index seek, so cost does not grow with
+        the page number.
+        """
+        conditions = []
+        params = []
+        if after is not None:
+            conditions.append('(name, id) > (?, ?)')
+            params.extend(after)
+        if until is not None:
+            conditions.append('(name, id) < (?, ?)')
+            params.extend(until)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        
+        contacts = self._query_contacts(f'''
+            SELECT * FROM contacts
+            {where}
+            ORDER BY name, id
+            LIMIT ?
+        ''', (*params, limit + 1))
+        
+        next_cursor = None
+        if len(contacts) > limit:
+            contacts = contacts[:limit]
+            next_cursor = (contacts[-1]['name'], contacts[-1]['id'])
         
-        conn.close()
-        return None
+        return contacts, next_cursor
+    
+    def iter_contacts(self, chunk_size: int = 500) -> Iterator[Dict]:
+        """Yield every contact ordered by name, reading ``chunk_size`` rows at a time.
+        
+        Rows come from one server-side cursor, so memory is bounded by the
+        chunk size. A pooled connection stays checked out until the
+        generator is exhausted or closed.
+        """
+        with self.pool.checkout() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT * FROM contacts ORDER BY name, id')
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield from self._rows_to_contacts(rows)
+    
+    @_cached
+    def count_contacts(self) -> int:
+        """Count all contacts without loading them."""
+        with self.pool.connection() as conn:
+            return conn.execute('SELECT COUNT(*) FROM contacts').fetchone()[0]
+    
+    @_cached
+    def get_contact_by_id(self, contact_id: int) -> Optional[Dict]:
+        """Get a specific contact by ID."""
+        contacts = self._query_contacts('SELECT * FROM contacts WHERE id = ?', (contact_id,))
+        return contacts[0] if contacts else None
     
     def update_contact(self, contact_id: int, name: str = None, nickname: str = None,
                       birthday: str = None, address: str = None, personality_notes: str = None,
                       social_media: dict = None, tags: List[str] = None,
-                      like_as_friend: bool = None, like_romantically: bool = None) -> bool:
-        """Update an existing contact."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # First, get the current contact
-        current = self.get_contact_by_id(contact_id)
-        if not current:
-            conn.close()
-            return False
+                      like_as_friend: bool = None, like_romantically: bool = None,
+                      expected_version: int = None) -> bool:
+        """Update an existing contact.
         
-        # Update only provided fields
-        updated_name = name if name is not None else current['name']
-        updated_nickname = nickname if nickname is not None else current['nickname']
-        updated_birthday = birthday if birthday is not None else current['birthday']
-        updated_address = address if address is not None else current.get('address', '')
-        updated_personality = personality_notes if personality_notes is not None else current['personality_notes']
-        updated_social = social_media if social_media is not None else current['social_media']
-        updated_tags = tags if tags is not None else current['tags']
-        updated_friend = like_as_friend if like_as_friend is not None else current.get('like_as_friend', False)
-        updated_romantic = like_romantically if like_romantically is not None else current.get('like_romantically', False)
+        Only the fields that are not None are written, in one UPDATE that
+        also bumps the contact's version. Pass the version the edit was
+        based on as ``expected_version`` to raise ConcurrentUpdateError
+        instead of overwriting a newer change. Returns False if the contact
+        does not exist.
+        """
+        values = {
+            'name': name,
+            'nickname': nickname,
+            'birthday': birthday,
+            'address': address,
+            'personality_notes': personality_notes,
+            'social_media': json.dumps(social_media) if social_media is not None else None,
+            'tags': json.dumps(tags) if tags is not None else None,
+            'like_as_friend': bool(like_as_friend) if like_as_friend is not None else None,
+            'like_romantically': bool(like_romantically) if like_romantically is not None else None,
+        }
+        updates = [(column, values[column]) for column in UPDATABLE_COLUMNS if values[column] is not None]
         
-        cursor.execute('''
-            UPDATE contacts 
-            SET name = ?, nickname = ?, birthday = ?, address = ?, personality_notes = ?, 
-                social_media = ?, tags = ?, like_as_friend = ?, like_romantically = ?, updated_at = CURRENT_TIMESTAMP
-            WHERE id = ?
-        ''', (updated_name, updated_nickname, updated_birthday, updated_address, updated_personality,
-              json.dumps(updated_social), json.dumps(updated_tags), updated_friend, updated_romantic, contact_id))
+        assignments = ''.join(f'{column} = ?, ' for column, _ in updates)
+        sql = f'UPDATE contacts SET {assignments}version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE id = ?'
+        params = [value for _, value in updates] + [contact_id]
+        if expected_version is not None:
+            sql += ' AND version = ?'
+            params.append(expected_version)
         
-        success = cursor.rowcount > 0
-        conn.commit()
-        conn.close()
+        with self._write_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(sql, params)
+            
+            if cursor.rowcount == 0:
+                if expected_version is None:
+                    return False
+                cursor.execute('SELECT version FROM contacts WHERE id = ?', (contact_id,))
+                row = cursor.fetchone()
+                if row is None:
+                    return False
+                raise ConcurrentUpdateError(contact_id, expected_version, row[0])
+            
+            if tags is not None:
+                self._sync_tags(cursor, contact_id, tags)
         
-        return success
+        return True
+    
+    @staticmethod
+    def changed_fields(contact: Dict, values: Dict) -> Dict:
+        """Return the entries of ``values`` that differ from ``contact``.
+        
+        Used by the edit forms so update_contact only writes what the user
+        changed; None and '' count as the same empty value.
+        """
+        changes = {}
+        for field, value in values.items():
+            if field not in UPDATABLE_COLUMNS:
+                continue
+            current = contact.get(field)
+            if field in ('like_as_friend', 'like_romantically'):
+                unchanged = bool(current) == bool(value)
+            else:
+                unchanged = (current or '') == (value or '')
+            if not unchanged:
+                changes[field] = value
+        return changes
     
     def delete_contact(self, contact_id: int) -> bool:
         """Delete a contact by ID."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._write_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('DELETE FROM contacts WHERE id = ?', (contact_id,))
+            success = cursor.rowcount > 0
+            cursor.execute('DELETE FROM contact_tags WHERE contact_id = ?', (contact_id,))
         
-        cursor.execute('DELETE FROM contacts WHERE id = ?', (contact_id,))
-        success = cursor.rowcount > 0
+        return success
+    
+    def delete_contacts(self, contact_ids: Iterable[int]) -> int:
+        """Delete many contacts in one transaction; returns how many existed."""
+        rows = [(int(contact_id),) for contact_id in set(contact_ids)]
+        with self._write_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany('DELETE FROM contacts WHERE id = ?', rows)
+            deleted = cursor.rowcount
+            cursor.executemany('DELETE FROM contact_tags WHERE contact_id = ?', rows)
         
-        conn.commit()
-        conn.close()
+        return deleted
+    
+    @staticmethod
+    def _clean_tag(tag: str) -> str:
+        """Strip a tag name, rejecting empty ones."""
+        tag = str(tag or '').strip()
+        if not tag:
+            raise ValueError("Tag must not be empty")
+        return tag
+    
+    def _rewrite_tags(self, cursor: sqlite3.Cursor, contact_ids: Iterable[int],
+                      transform: Callable[[List[str]], List[str]]) -> int:
+        """Apply ``transform`` to the tag list of each contact, in the caller's transaction.
         
-        return success
+        Contacts whose tags come back unchanged are not written. The rest get
+        their tags column, version and contact_tags rows updated with one
+        executemany() each. Returns the number of contacts changed.
+        """
+        ids = sorted({int(contact_id) for contact_id in contact_ids})
+        changed = []
+        for start in range(0, len(ids), ID_BATCH_SIZE):
+            batch = ids[start:start + ID_BATCH_SIZE]
+            placeholders = ', '.join('?' * len(batch))
+            cursor.execute(f'SELECT id, tags FROM contacts WHERE id IN ({placeholders})', batch)
+            for contact_id, tags_json in cursor.fetchall():
+                tags = self._parse_tags(tags_json)
+                new_tags = transform(tags)
+                if new_tags != tags:
+                    changed.append((contact_id, new_tags))
+        
+        cursor.executemany('''
+            UPDATE contacts SET tags = ?, version = version + 1, updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        ''', [(json.dumps(tags), contact_id) for contact_id, tags in changed])
+        cursor.executemany('DELETE FROM contact_tags WHERE contact_id = ?',
+                           [(contact_id,) for contact_id, _ in changed])
+        cursor.executemany('INSERT OR IGNORE INTO contact_tags (contact_id, tag) VALUES (?, ?)',
+                           [row for contact_id, tags in changed for row in self._tag_rows(contact_id, tags)])
+        return len(changed)
+    
+    def add_tag_to_contacts(self, contact_ids: Iterable[int], tag: str) -> int:
+        """Add a tag to every given contact; returns how many gained it."""
+        tag = self._clean_tag(tag)
+        with self._write_connection() as conn:
+            return self._rewrite_tags(conn.cursor(), contact_ids,
+                                      lambda tags: tags if tag in tags else tags + [tag])
+    
+    def remove_tag_from_contacts(self, contact_ids: Iterable[int], tag: str) -> int:
+        """Remove a tag from every given contact; returns how many had it."""
+        tag = self._clean_tag(tag)
+        with self._write_connection() as conn:
+            return self._rewrite_tags(conn.cursor(), contact_ids,
+                                      lambda tags: [t for t in tags if t != tag])
     
+    def rename_tag(self, old_tag: str, new_tag: str, contact_ids: Iterable[int] = None) -> int:
+        """Rename a tag on the given contacts, or on every contact if None.
+        
+        Contacts that already have ``new_tag`` keep a single copy of it.
+        Tag names match exactly. Returns the number of contacts changed.
+        """
+        old_tag = self._clean_tag(old_tag)
+        new_tag = self._clean_tag(new_tag)
+        
+        def rename(tags):
+            if old_tag not in tags:
+                return tags
+            renamed = []
+            for tag in tags:
+                tag = new_tag if tag == old_tag else tag
+                if tag not in renamed:
+                    renamed.append(tag)
+            return renamed
+        
+        with self._write_connection() as conn:
+            cursor = conn.cursor()
+            if contact_ids is None:
+                # Narrow to candidates through the tag index; rename() checks the exact case
+                cursor.execute('SELECT contact_id FROM contact_tags WHERE tag = ? COLLATE NOCASE', (old_tag,))
+                contact_ids = [row[0] for row in cursor.fetchall()]
+            return self._rewrite_tags(cursor, contact_ids, rename)
+    
+    def merge_tags(self, source_tag: str, target_tag: str) -> int:
+        """Fold ``source_tag`` into ``target_tag`` across all contacts.
+        
+        Every contact tagged ``source_tag`` ends up with ``target_tag``
+        instead, without duplicates. Returns the number of contacts changed.
+        """
+        return self.rename_tag(source_tag, target_tag)
+    
+    @staticmethod
+    def _fts_query(query: str) -> str:
+        """Turn free text into an FTS5 query matching every word as a prefix."""
+        terms = re.findall(r'\w+', query)
+        return ' '.join('"' + term + '"*' for term in terms)
+    
+    @_cached
     def search_contacts(self, query: str) -> List[Dict]:
-        """Search contacts by name, nickname, or tags."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        """Search contacts by name, nickname, tags, address, or notes.
         
-        # Search in name, nickname, and tags
-        cursor.execute('''
+        Uses the FTS5 index with prefix matching and bm25 ranking (name
+        matches first), or LIKE matching when FTS5 is unavailable.
+        """
+        match = self._fts_query(query)
+        if not self.fts_enabled or not match:
+            return self._search_contacts_like(query)
+        
+        return self._query_contacts('''
+            SELECT contacts.* FROM contacts_fts
+            JOIN contacts ON contacts.id = contacts_fts.rowid
+            WHERE contacts_fts MATCH ?
+            ORDER BY bm25(contacts_fts, 10.0, 5.0, 3.0, 1.0, 1.0), contacts.name
+        ''', (match,))
+    
+    def _search_contacts_like(self, query: str) -> List[Dict]:
+        """Search contacts by name, nickname, or tag prefix without FTS5."""
+        # Search in name and nickname, and match tag prefixes through the tag index
+        tag_prefix = query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+        return self._query_contacts('''
             SELECT * FROM contacts 
-            WHERE name LIKE ? OR nickname LIKE ? OR tags LIKE ?
+            WHERE name LIKE ? OR nickname LIKE ?
+               OR id IN (SELECT contact_id FROM contact_tags WHERE tag LIKE ? ESCAPE '\\')
             ORDER BY name
-        ''', (f'%{query}%', f'%{query}%', f'%{query}%'))
-        
-        rows = cursor.fetchall()
-        contacts = []
-        for row in rows:
-            # Safe JSON parsing with error handling
-            try:
-                social_media = json.loads(row[6]) if len(row) > 6 and row[6] else {}
-            except (json.JSONDecodeError, TypeError):
-                social_media = {}
-            
-            try:
-                tags = json.loads(row[7]) if len(row) > 7 and row[7] else []
-            except (json.JSONDecodeError, TypeError):
-                tags = []
-            
-            contact = {
-                'id': row[0],
-                'name': row[1],
-                'nickname': row[2],
-                'birthday': row[3],
-                'address': row[4] if len(row) > 4 else '',
-                'personality_notes': row[5] if len(row) > 5 else '',
-                'social_media': social_media,
-                'tags': tags,
-                'like_as_friend': bool(row[8]) if len(row) > 8 else False,
-                'like_romantically': bool(row[9]) if len(row) > 9 else False,
-                'created_at': row[10] if len(row) > 10 else '',
-                'updated_at': row[11] if len(row) > 11 else ''
-            }
-            contacts.append(contact)
-        
-        conn.close()
-        return contacts
+        ''', (f'%{query}%', f'%{query}%', tag_prefix))
     
+    @_cached
     def filter_by_tag(self, tag: str) -> List[Dict]:
-        """Filter contacts by a specific tag."""
-        all_contacts = self.get_all_contacts()
-        filtered = []
+        """Filter contacts by a specific tag (case-insensitive)."""
+        return self._query_contacts('''
+            SELECT * FROM contacts
+            WHERE id IN (SELECT contact_id FROM contact_tags WHERE tag = ? COLLATE NOCASE)
+            ORDER BY name
+        ''', (tag,))
+    
+    @staticmethod
+    def _contact_to_csv_row(contact: Dict) -> List:
+        """Flatten a contact into a row matching CSV_FIELDS."""
+        return [
+            contact['id'],
+            contact['name'],
+            contact['nickname'],
+            contact['birthday'],
+            contact.get('address', ''),
+            contact['personality_notes'],
+            json.dumps(contact['social_media']),
+            ', '.join(str(tag) for tag in contact['tags']),
+            'Yes' if contact.get('like_as_friend') else 'No',
+            'Yes' if contact.get('like_romantically') else 'No',
+            contact['created_at'],
+            contact['updated_at']
+        ]
+    
+    def iter_csv(self, chunk_size: int = 500) -> Iterator[str]:
+        """Yield a CSV export of all contacts as text chunks.
         
-        for contact in all_contacts:
-            if tag.lower() in [t.lower() for t in contact['tags']]:
-                filtered.append(contact)
+        Rows are streamed from iter_contacts and flushed every
+        ``chunk_size`` rows, so memory use doesn't depend on the row count.
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(CSV_FIELDS)
+        pending = 1
         
-        return filtered
+        for contact in self.iter_contacts(chunk_size=chunk_size):
+            writer.writerow(self._contact_to_csv_row(contact))
+            pending += 1
+            if pending >= chunk_size:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+                pending = 0
+        
+        if pending:
+            yield buffer.getvalue()
     
     def export_to_csv(self, filename: str = None) -> str:
-        """Export all contacts to CSV format."""
-        contacts = self.get_all_contacts()
-        
+        """Export all contacts to a CSV file and return its name."""
         if not filename:
             filename = f"contacts_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
         
-        # Flatten the data for CSV export
-        csv_data = []
-        for contact in contacts:
-            row = {
-                'ID': contact['id'],
-                'Name': contact['name'],
-                'Nickname': contact['nickname'],
-                'Birthday': contact['birthday'],
-                'Address': contact.get('address', ''),
-                'Personality Notes': contact['personality_notes'],
-                'Social Media': json.dumps(contact['social_media']),
-                'Tags': ', '.join(contact['tags']),
-                'Like as Friend': 'Yes' if contact.get('like_as_friend') else 'No',
-                'Like Romantically': 'Yes' if contact.get('like_romantically') else 'No',
-                'Created At': contact['created_at'],
-                'Updated At': contact['updated_at']
-            }
-            csv_data.append(row)
-        
-        # Write to CSV file
         with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-            if csv_data:
-                writer = csv.DictWriter(csvfile, fieldnames=csv_data[0].keys())
-                writer.writeheader()
-                writer.writerows(csv_data)
+            for chunk in self.iter_csv():
+                csvfile.write(chunk)
         
         return filename
     
+    @_cached
     def get_all_tags(self) -> List[str]:
         """Get all unique tags from all contacts."""
-        contacts = self.get_all_contacts()
-        all_tags = set()
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT tag FROM tag_counts ORDER BY tag')
+            return [row[0] for row in cursor.fetchall()]
+    
+    def get_stats(self) -> Dict:
+        """Summary counts for stats panels, computed with indexed aggregates.
         
-        for contact in contacts:
-            all_tags.update(contact['tags'])
+        'created_this_month' counts contacts created since the first of the
+        current month (UTC, like the created_at timestamps).
+        """
+        return self._stats_since(datetime.now(timezone.utc).strftime('%Y-%m-01'))
+    
+    @_cached
+    def _stats_since(self, month_start: str) -> Dict:
+        # The month is part of the cache key, so a new month is not served stale counts
+        with self.pool.connection() as conn:
+            row = conn.execute('''
+                SELECT
+                    (SELECT COUNT(*) FROM contacts),
+                    (SELECT COUNT(*) FROM tag_counts),
+                    (SELECT COUNT(*) FROM contacts WHERE like_as_friend = 1),
+                    (SELECT COUNT(*) FROM contacts WHERE like_romantically = 1),
+                    (SELECT COUNT(*) FROM contacts WHERE created_at >= ?),
+                    (SELECT COUNT(*) FROM contacts WHERE birthday IS NULL OR birthday = '')
+            ''', (month_start,)).fetchone()
         
-        return sorted(list(all_tags))
+        return {
+            'total_contacts': row[0],
+            'unique_tags': row[1],
+            'friends': row[2],
+            'romantic': row[3],
+            'created_this_month': row[4],
+            'missing_birthday': row[5]
+        }
+    
+    @_cached
+    def get_tag_counts(self) -> List[Dict]:
+        """Get every tag with the number of contacts using it, sorted by tag."""
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT tag, count FROM tag_counts ORDER BY tag')
+            return [{'tag': tag, 'count': count} for tag, count in cursor.fetchall()]
+
+# Method names _calling_method attributes statements to
+_PUBLIC_METHODS = frozenset(name for name in dir(ContactDatabase) if not name.startswith('_'))
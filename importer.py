@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Contact import pipeline for The People DB
+Reads CSV files in the export_to_csv layout or NDJSON (one contact object per
+line), validates records across a process pool and commits them in large
+batches from a single writer thread
+
+Usage: python importer.py <file.csv|file.ndjson> [csv|ndjson]
+"""
+
+import csv
+import json
+import os
+import queue
+import sys
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from database import ContactDatabase, CSV_FIELDS
+
+# Records handed to a worker process at a time
+PARSE_CHUNK_SIZE = 1000
+
+# Contacts committed per writer transaction
+WRITE_BATCH_SIZE = 5000
+
+# Files smaller than this are parsed in-process; starting workers costs more
+PARALLEL_MIN_BYTES = 1024 * 1024
+
+# Export column headers mapped to contact fields; ID and timestamps are not imported
+CSV_FIELD_MAP = {
+    'Name': 'name',
+    'Nickname': 'nickname',
+    'Birthday': 'birthday',
+    'Address': 'address',
+    'Personality Notes': 'personality_notes',
+    'Social Media': 'social_media',
+    'Tags': 'tags',
+    'Like as Friend': 'like_as_friend',
+    'Like Romantically': 'like_romantically',
+}
+
+# Recognized birthday spellings, normalized to YYYY-MM-DD; others are imported as written
+BIRTHDAY_FORMATS = [
+    '%Y-%m-%d', '%Y/%m/%d', '%Y%m%d', '%d.%m.%Y', '%m/%d/%Y',
+    '%d %B %Y', '%d %b %Y', '%B %d, %Y', '%b %d, %Y',
+]
+
+TRUE_VALUES = {'yes', 'y', 'true', '1'}
+FALSE_VALUES = {'no', 'n', 'false', '0', ''}
+
+def detect_format(path: str) -> str:
+    """Guess 'csv' or 'ndjson' from the file extension."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in ('.ndjson', '.jsonl', '.json'):
+        return 'ndjson'
+    return 'csv'
+
+def read_records(path: str, fmt: str) -> Iterator[Tuple[int, object]]:
+    """Yield (line number, raw record) pairs without parsing field values.
+    
+    CSV records are dicts keyed by contact field; NDJSON records are the raw
+    line text so JSON decoding also happens in the worker processes.
+    """
+    if fmt == 'ndjson':
+        with open(path, 'r', encoding='utf-8-sig') as ndjson_file:
+            for line_no, line in enumerate(ndjson_file, 1):
+                if line.strip():
+                    yield line_no, line
+        return
+    
+    with open(path, 'r', newline='', encoding='utf-8-sig') as csv_file:
+        reader = csv.DictReader(csv_file)
+        if reader.fieldnames and 'Name' not in reader.fieldnames and 'name' not in reader.fieldnames:
+            raise ValueError(f"CSV file has no 'Name' column (expected headers: {', '.join(CSV_FIELDS)})")
+        
+        for row in reader:
+            record = {}
+            for header, value in row.items():
+                if header is None:
+                    continue  # Extra unnamed cells
+                field = CSV_FIELD_MAP.get(header.strip(), header.strip())
+                record[field] = value
+            yield reader.line_num, record
+
+def normalize_birthday(value: str) -> str:
+    """Return the birthday as YYYY-MM-DD, or unchanged if no format matches.
+    
+    The app stores birthdays as free text, so values such as "Jan 5" are
+    kept rather than failing the row.
+    """
+    value = value.strip()
+    if not value:
+        return ''
+    
+    for fmt in BIRTHDAY_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).strftime('%Y-%m-%d')
+        except ValueError:
+            continue
+    return value
+
+def parse_flag(value, field: str) -> bool:
+    """Parse a Yes/No style flag."""
+    if isinstance(value, bool):
+        return value
+    text = str(value if value is not None else '').strip().lower()
+    if text in TRUE_VALUES:
+        return True
+    if text in FALSE_VALUES:
+        return False
+    raise ValueError(f"{field} must be Yes or No, got '{value}'")
+
+def parse_record(raw) -> Dict:
+    """Validate one raw record and convert it into add_contact arguments.
+    
+    Raises ValueError with a user-facing message when the record is invalid.
+    """
+    if isinstance(raw, str):
+        try:
+            raw = json.loads(raw)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON: {e.msg}")
+    if not isinstance(raw, dict):
+        raise ValueError("Each record must be a JSON object")
+    
+    name = str(raw.get('name') or '').strip()
+    if not name:
+        raise ValueError("Name is required")
+    
+    social_media = raw.get('social_media') or {}
+    if isinstance(social_media, str):
+        try:
+            social_media = json.loads(social_media) if social_media.strip() else {}
+        except json.JSONDecodeError:
+            raise ValueError("Invalid JSON format for social media")
+    if not isinstance(social_media, dict):
+        raise ValueError("Social media must be a JSON object")
+    
+    tags = raw.get('tags') or []
+    if isinstance(tags, str):
+        tags = tags.split(',')
+    if not isinstance(tags, list):
+        raise ValueError("Tags must be a list or a comma-separated string")
+    tags = [str(tag).strip() for tag in tags if str(tag).strip()]
+    
+    # Free text is kept as-is so an export followed by an import round-trips it
+    return {
+        'name': name,
+        'nickname': str(raw.get('nickname') or '').strip(),
+        'birthday': normalize_birthday(str(raw.get('birthday') or '')),
+        'address': str(raw.get('address') or ''),
+        'personality_notes': str(raw.get('personality_notes') or ''),
+        'social_media': social_media,
+        'tags': tags,
+        'like_as_friend': parse_flag(raw.get('like_as_friend', False), 'Like as Friend'),
+        'like_romantically': parse_flag(raw.get('like_romantically', False), 'Like Romantically'),
+    }
+
+def parse_chunk(chunk: List[Tuple[int, object]]) -> List[Tuple[int, Optional[Dict], Optional[str]]]:
+    """Parse a chunk of records; runs inside the worker processes."""
+    results = []
+    for line_no, raw in chunk:
+        try:
+            results.append((line_no, parse_record(raw), None))
+        except ValueError as e:
+            results.append((line_no, None, str(e)))
+    return results
+
+def _chunked(records: Iterable, size: int) -> Iterator[List]:
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _parse_chunks(chunks: Iterator[List], workers: int) -> Iterator[List]:
+    """Parse chunks in order, keeping at most two chunks per worker in flight."""
+    if workers <= 1:
+        for chunk in chunks:
+            yield parse_chunk(chunk)
+        return
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        in_flight = deque()
+        for chunk in chunks:
+            in_flight.append(executor.submit(parse_chunk, chunk))
+            if len(in_flight) >= workers * 2:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+def import_contacts(db: ContactDatabase, path: str, fmt: str = None, workers: int = None,
+                    batch_size: int = WRITE_BATCH_SIZE,
+                    progress: Callable[[Dict], None] = None) -> Dict:
+    """Import contacts from a CSV or NDJSON file.
+    
+    Parsing runs on ``workers`` processes (default: one per CPU for files
+    over PARALLEL_MIN_BYTES), while one writer thread commits valid rows with
+    add_contacts_bulk in batches of ``batch_size``. ``progress`` is called
+    with the report after every committed batch.
+    
+    Returns a report dict with 'processed', 'imported' and 'failed' counts,
+    the new 'ids', and 'errors' as [{'line': n, 'error': message}, ...].
+    """
+    fmt = fmt or detect_format(path)
+    if fmt not in ('csv', 'ndjson'):
+        raise ValueError(f"Unsupported import format: {fmt!r}")
+    if workers is None:
+        workers = (os.cpu_count() or 1) if os.path.getsize(path) >= PARALLEL_MIN_BYTES else 1
+    
+    report = {'processed': 0, 'imported': 0, 'failed': 0, 'ids': [], 'errors': []}
+    lock = threading.Lock()
+    batches = queue.Queue(maxsize=4)
+    
+    def write_batches():
+        while True:
+            batch = batches.get()
+            if batch is None:
+                break
+            rows = [contact for _, contact in batch]
+            try:
+                ids = db.add_contacts_bulk(rows, batch_size=len(rows))
+            except Exception as e:
+                with lock:
+                    report['failed'] += len(batch)
+                    report['errors'].extend({'line': line_no, 'error': f"Database error: {e}"}
+                                            for line_no, _ in batch)
+            else:
+                with lock:
+                    report['imported'] += len(ids)
+                    report['ids'].extend(ids)
+            if progress:
+                progress(report)
+    
+    writer = threading.Thread(target=write_batches, name='import-writer', daemon=True)
+    writer.start()
+    
+    pending = []
+    try:
+        chunks = _chunked(read_records(path, fmt), PARSE_CHUNK_SIZE)
+        for results in _parse_chunks(chunks, workers):
+            with lock:
+                for line_no, contact, error in results:
+                    report['processed'] += 1
+                    if error:
+                        report['failed'] += 1
+                        report['errors'].append({'line': line_no, 'error': error})
+                    else:
+                        pending.append((line_no, contact))
+            
+            if len(pending) >= batch_size:
+                batches.put(pending)
+                pending = []
+        
+        if pending:
+            batches.put(pending)
+    finally:
+        batches.put(None)
+        writer.join()
+    
+    report['errors'].sort(key=lambda entry: entry['line'])
+    return report
+
+def print_import_report(report: Dict, limit: int = 20):
+    """Print an import summary followed by the first ``limit`` row errors."""
+    print(f"✅ Imported {report['imported']} of {report['processed']} records")
+    if not report['errors']:
+        return
+    
+    print(f"⚠️  {report['failed']} records were skipped:")
+    for entry in report['errors'][:limit]:
+        print(f"   Line {entry['line']}: {entry['error']}")
+    if len(report['errors']) > limit:
+        print(f"   ... and {len(report['errors']) - limit} more")
+
+def main():
+    """Import the file named on the command line into contacts.db."""
+    if len(sys.argv) < 2:
+        print("Usage: python importer.py <file.csv|file.ndjson> [csv|ndjson]")
+        sys.exit(1)
+    
+    path = sys.argv[1]
+    fmt = sys.argv[2] if len(sys.argv) > 2 else None
+    if not os.path.exists(path):
+        print(f"❌ File {path} not found!")
+        sys.exit(1)
+    
+    def show_progress(report):
+        print(f"\r⏳ {report['processed']} read, {report['imported']} imported, "
+              f"{report['failed']} skipped", end='', flush=True)
+    
+    print(f"📥 Importing {path}...")
+    try:
+        report = import_contacts(ContactDatabase(), path, fmt=fmt, progress=show_progress)
+    except (OSError, ValueError) as e:
+        print(f"\n❌ Error importing contacts: {e}")
+        sys.exit(1)
+    
+    print()
+    print_import_report(report)
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ from textual.widgets import (
     Static, Label, Select, Collapsible, TabbedContent, TabPane, Checkbox
 )
 from textual.screen import Screen, ModalScreen
+from textual.widgets.data_table import RowKey
 from textual.binding import Binding
 from textual import events
 from textual.reactive import reactive
@@ -14,10 +15,128 @@ from rich.table import Table
 from rich.panel import Panel
 from rich.columns import Columns
 from rich.align import Align
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
+from datetime import datetime, timezone
+import bisect
 import json
 
-from database import ContactDatabase
+from database import ContactDatabase, ConcurrentUpdateError
+
+# Contacts fetched per page, pages kept in the table at once, and how close the
+# cursor gets to either end of the loaded rows before the next page is fetched
+WINDOW_PAGE_SIZE = 100
+WINDOW_MAX_PAGES = 5
+PREFETCH_ROWS = 50
+
+class ContactWindow:
+    """Consecutive pages of contacts in name order, read on demand with list_contacts.
+    
+    At most ``max_pages`` pages are held. Loading a page past either end
+    evicts the page at the other end; the keyset cursor each page started
+    from is remembered, so evicted pages can be read again when scrolling
+    back without loading everything before them.
+    """
+    
+    def __init__(self, db: ContactDatabase, page_size: int = WINDOW_PAGE_SIZE,
+                 max_pages: int = WINDOW_MAX_PAGES):
+        self.db = db
+        self.page_size = page_size
+        self.max_pages = max(2, max_pages)
+        self.reset()
+    
+    def reset(self):
+        """Drop every loaded page and read the first one again."""
+        contacts, self.next_cursor = self.db.list_contacts(limit=self.page_size)
+        self.pages = [contacts]
+        self.page_starts = [None]   # 'after' cursor of each page seen, by page number
+        self.first_page = 0         # page number of self.pages[0]
+    
+    @property
+    def contacts(self) -> List[Dict]:
+        """The loaded contacts, in order."""
+        return [contact for page in self.pages for contact in page]
+    
+    @property
+    def offset(self) -> int:
+        """Approximate number of contacts before the first loaded one."""
+        return self.first_page * self.page_size
+    
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+    
+    @property
+    def has_previous(self) -> bool:
+        return self.first_page > 0
+    
+    def load_next(self) -> Tuple[List[Dict], List[Dict]]:
+        """Read the page after the window; returns (added, evicted) contacts."""
+        if self.next_cursor is None:
+            return [], []
+        
+        page_number = self.first_page + len(self.pages)
+        del self.page_starts[page_number:]
+        self.page_starts.append(self.next_cursor)
+        contacts, self.next_cursor = self.db.list_contacts(after=self.next_cursor, limit=self.page_size)
+        self.pages.append(contacts)
+        
+        evicted = []
+        while len(self.pages) > self.max_pages:
+            evicted.extend(self.pages.pop(0))
+            self.first_page += 1
+        return contacts, evicted
+    
+    def load_previous(self) -> Tuple[List[Dict], List[Dict]]:
+        """Read the page before the window again; returns (added, evicted) contacts."""
+        if not self.first_page:
+            return [], []
+        
+        self.first_page -= 1
+        first = next((page[0] for page in self.pages if page), None)
+        until = (first['name'], first['id']) if first else None
+        # Bounded by the first loaded row, so rows added since still fit without overlap
+        contacts, _ = self.db.list_contacts(after=self.page_starts[self.first_page],
+                                            limit=self.page_size * self.max_pages, until=until)
+        self.pages.insert(0, contacts)
+        
+        evicted = []
+        while len(self.pages) > self.max_pages:
+            evicted.extend(self.pages.pop())
+            self.next_cursor = self.page_starts[self.first_page + len(self.pages)]
+        return contacts, evicted
+    
+    def covers(self, key: Tuple[str, int]) -> bool:
+        """Whether a (name, id) key falls inside the loaded range of pages."""
+        lower = self.page_starts[self.first_page]
+        if lower is not None and key <= lower:
+            return False
+        return self.next_cursor is None or key <= self.next_cursor
+    
+    def upsert(self, contact: Dict) -> bool:
+        """Put an added or edited contact in its place; returns whether it is loaded.
+        
+        Contacts that now sort outside the loaded range are dropped; they
+        come back with their page when it is read.
+        """
+        self.remove(contact['id'])
+        key = (contact['name'], contact['id'])
+        if not self.covers(key):
+            return False
+        
+        page = next((page for page in self.pages if page and (page[-1]['name'], page[-1]['id']) >= key),
+                    self.pages[-1])
+        keys = [(entry['name'], entry['id']) for entry in page]
+        page.insert(bisect.bisect_left(keys, key), contact)
+        return True
+    
+    def remove(self, contact_id: int) -> bool:
+        """Drop a contact from the loaded pages; returns whether it was loaded."""
+        for page in self.pages:
+            for index, entry in enumerate(page):
+                if entry['id'] == contact_id:
+                    del page[index]
+                    return True
+        return False
 
 class ContactFormScreen(ModalScreen):
     """Modal screen for adding or editing contacts."""
@@ -242,6 +361,55 @@ class ContactDetailScreen(ModalScreen):
         elif event.button.id == "close_btn":
             self.dismiss(None)
 
+class TagPromptScreen(ModalScreen):
+    """Modal screen asking for a tag to add to or remove from selected contacts."""
+    
+    def __init__(self, count: int):
+        super().__init__()
+        self.count = count
+    
+    def compose(self) -> ComposeResult:
+        with Container(classes="prompt-dialog"):
+            yield Static(f"Tag {self.count} selected contacts", classes="form-title")
+            yield Input(placeholder="Tag name", id="bulk_tag_input")
+            
+            with Horizontal():
+                yield Button("Add Tag", variant="primary", id="add_tag_btn")
+                yield Button("Remove Tag", variant="warning", id="remove_tag_btn")
+                yield Button("Cancel", variant="default", id="cancel_btn")
+    
+    def on_button_pressed(self, event: Button.Pressed) -> None:
+        if event.button.id == "cancel_btn":
+            self.dismiss(None)
+            return
+        
+        tag = self.query_one("#bulk_tag_input", Input).value.strip()
+        if not tag:
+            self.notify("Tag name is required!", severity="error")
+            return
+        
+        action = "add" if event.button.id == "add_tag_btn" else "remove"
+        self.dismiss({"action": action, "tag": tag})
+
+class ConfirmScreen(ModalScreen):
+    """Modal screen asking the user to confirm a destructive action."""
+    
+    def __init__(self, message: str, confirm_label: str = "Delete"):
+        super().__init__()
+        self.message = message
+        self.confirm_label = confirm_label
+    
+    def compose(self) -> ComposeResult:
+        with Container(classes="prompt-dialog"):
+            yield Static(self.message, classes="form-title")
+            
+            with Horizontal():
+                yield Button(self.confirm_label, variant="error", id="confirm_btn")
+                yield Button("Cancel", variant="default", id="cancel_btn")
+    
+    def on_button_pressed(self, event: Button.Pressed) -> None:
+        self.dismiss(event.button.id == "confirm_btn")
+
 class ContactManagerApp(App):
     """Main TUI application for The People DB."""
     
@@ -277,6 +445,15 @@ class ContactManagerApp(App):
         margin-top: 1;
     }
     
+    .prompt-dialog {
+        width: 60%;
+        height: auto;
+        margin: 1 1;
+        padding: 1;
+        border: solid $primary;
+        background: $surface;
+    }
+    
     .search-bar {
         margin: 1;
     }
@@ -294,6 +471,9 @@ class ContactManagerApp(App):
         Binding("s", "search", "Search"),
         Binding("e", "export", "Export CSV"),
         Binding("r", "refresh", "Refresh"),
+        Binding("space", "toggle_select", "Select"),
+        Binding("t", "tag_selected", "Tag Selected"),
+        Binding("x", "delete_selected", "Delete Selected"),
         Binding("q", "quit", "Quit"),
         Binding("?", "help", "Help"),
     ]
@@ -301,9 +481,16 @@ class ContactManagerApp(App):
     def __init__(self):
         super().__init__()
         self.db = ContactDatabase()
-        self.contacts = []
+        self.window = ContactWindow(self.db)
         self.filtered_contacts = []
         self.current_search = ""
+        self.selected_ids = set()
+        self.id_column = None
+        self.contact_columns = []
+        self.count_column = None
+        # Mirrors of get_stats() and get_tag_counts(), adjusted in place after each change
+        self.stats = {}
+        self.tag_counts = {}
         
     def compose(self) -> ComposeResult:
         yield Header()
@@ -311,7 +498,7 @@ class ContactManagerApp(App):
         with Container():
             # Search bar
             with Horizontal(classes="search-bar"):
-                yield Input(placeholder="Search contacts by name or tag...", id="search_input")
+                yield Input(placeholder="Search by name, tag, address or notes...", id="search_input")
                 yield Button("Search", id="search_btn")
                 yield Button("Clear", id="clear_btn")
                 yield Button("Filter by Tag", id="tag_filter_btn")
@@ -334,19 +521,20 @@ class ContactManagerApp(App):
         self.refresh_contacts()
         self.setup_contacts_table()
         self.setup_tags_table()
-        self.update_stats()
+        self.load_stats()
     
     def setup_contacts_table(self):
         """Set up the contacts data table."""
         table = self.query_one("#contacts_table", DataTable)
-        table.add_columns("ID", "Name", "Nickname", "Birthday", "Relationship", "Tags")
+        self.contact_columns = table.add_columns("ID", "Name", "Nickname", "Birthday", "Relationship", "Tags")
+        self.id_column = self.contact_columns[0]
         table.cursor_type = "row"
         self.populate_contacts_table()
     
     def setup_tags_table(self):
         """Set up the tags data table."""
         table = self.query_one("#tags_table", DataTable)
-        table.add_columns("Tag", "Count")
+        self.count_column = table.add_columns("Tag", "Count")[1]
         table.cursor_type = "row"
         self.populate_tags_table()
     
@@ -355,62 +543,218 @@ class ContactManagerApp(App):
         table = self.query_one("#contacts_table", DataTable)
         table.clear()
         
-        contacts_to_show = self.filtered_contacts if self.current_search else self.contacts
+        # Without a search only the loaded window of pages is in the table
+        contacts_to_show = self.filtered_contacts if self.current_search else self.window.contacts
         
         for contact in contacts_to_show:
-            tags_str = ", ".join(contact.get('tags', []))
-            
-            # Format relationship status
-            relationship_status = []
-            if contact.get('like_as_friend'):
-                relationship_status.append("💙Friend")
-            if contact.get('like_romantically'):
-                relationship_status.append("💕Romantic")
-            relationship_str = " | ".join(relationship_status) if relationship_status else ""
-            
-            table.add_row(
-                str(contact.get('id', '')),
-                contact.get('name', ''),
-                contact.get('nickname', ''),
-                contact.get('birthday', ''),
-                relationship_str,
-                tags_str,
-                key=contact.get('id')
-            )
+            self.add_contact_row(table, contact)
+    
+    def contact_row_cells(self, contact: Dict) -> tuple:
+        """Cell values of a contact's row in the contacts table."""
+        tags_str = ", ".join(contact.get('tags', []))
+        
+        # Format relationship status
+        relationship_status = []
+        if contact.get('like_as_friend'):
+            relationship_status.append("💙Friend")
+        if contact.get('like_romantically'):
+            relationship_status.append("💕Romantic")
+        relationship_str = " | ".join(relationship_status) if relationship_status else ""
+        
+        return (
+            self.format_id_cell(contact.get('id')),
+            contact.get('name', ''),
+            contact.get('nickname', ''),
+            contact.get('birthday', ''),
+            relationship_str,
+            tags_str
+        )
+    
+    def add_contact_row(self, table: DataTable, contact: Dict):
+        """Append a contact's row unless the table already shows it."""
+        # Row keys hold integer ids, which only match when wrapped in a RowKey
+        if RowKey(contact.get('id')) not in table.rows:
+            table.add_row(*self.contact_row_cells(contact), key=contact.get('id'))
+    
+    def on_data_table_row_highlighted(self, event: DataTable.RowHighlighted) -> None:
+        """Page contacts in from the database as the cursor nears either end of the window."""
+        if event.data_table.id != "contacts_table" or self.current_search:
+            return
+        
+        # Read the live cursor: events queued before a reload carry stale positions
+        table = event.data_table
+        if not table.row_count:
+            return
+        cursor_row = table.cursor_row
+        if cursor_row >= table.row_count - PREFETCH_ROWS and self.window.has_next:
+            added, evicted = self.window.load_next()
+            for contact in added:
+                self.add_contact_row(table, contact)
+            removed = 0
+            for contact in evicted:
+                if RowKey(contact['id']) in table.rows:
+                    table.remove_row(RowKey(contact['id']))
+                    removed += 1
+            if removed:
+                # Rows above the cursor are gone; keep it on the same contact
+                table.move_cursor(row=cursor_row - removed, animate=False)
+        elif cursor_row < PREFETCH_ROWS and self.window.has_previous:
+            row_key = table.coordinate_to_cell_key(table.cursor_coordinate).row_key
+            self.window.load_previous()
+            # DataTable can only append, so rebuild the (bounded) window in order
+            self.populate_contacts_table()
+            if row_key in table.rows:
+                table.move_cursor(row=table.get_row_index(row_key), animate=False)
+    
+    def format_id_cell(self, contact_id) -> str:
+        """ID column text, marked when the contact is selected for a bulk action."""
+        if contact_id in self.selected_ids:
+            return f"✓ {contact_id}"
+        return str(contact_id if contact_id is not None else '')
     
     def populate_tags_table(self):
         """Populate the tags table with tag statistics."""
         table = self.query_one("#tags_table", DataTable)
         table.clear()
         
-        all_tags = self.db.get_all_tags()
-        tag_counts = {}
+        # Counts come from the tag_counts summary table, not from loaded contacts
+        self.tag_counts = {entry['tag']: entry['count'] for entry in self.db.get_tag_counts()}
+        for tag, count in self.tag_counts.items():
+            table.add_row(tag, str(count), key=tag)
+    
+    def adjust_tag_count(self, tag: str, delta: int):
+        """Change one tag's count in the tags table without reloading it."""
+        table = self.query_one("#tags_table", DataTable)
+        count = self.tag_counts.get(tag, 0) + delta
+        if count <= 0:
+            self.tag_counts.pop(tag, None)
+            if tag in table.rows:
+                table.remove_row(tag)
+        elif tag in table.rows:
+            self.tag_counts[tag] = count
+            table.update_cell(tag, self.count_column, str(count))
+        else:
+            self.tag_counts[tag] = count
+            table.add_row(tag, str(count), key=tag)
+            # Same order as get_tag_counts (by tag); bounded by the number of tags
+            table.sort(table.ordered_columns[0].key)
+    
+    def apply_contact_delta(self, contact: Dict, sign: int):
+        """Add (sign=1) or remove (sign=-1) one contact's share of the stats and tag counts.
         
-        for contact in self.contacts:
-            for tag in contact.get('tags', []):
-                tag_counts[tag] = tag_counts.get(tag, 0) + 1
+        Mirrors the aggregates behind get_stats() and the tag_counts table.
+        """
+        if not contact:
+            return
+        month_start = datetime.now(timezone.utc).strftime('%Y-%m-01')
+        self.stats['total_contacts'] += sign
+        if contact.get('like_as_friend'):
+            self.stats['friends'] += sign
+        if contact.get('like_romantically'):
+            self.stats['romantic'] += sign
+        if not contact.get('birthday'):
+            self.stats['missing_birthday'] += sign
+        if (contact.get('created_at') or '') >= month_start:
+            self.stats['created_this_month'] += sign
         
-        for tag in sorted(tag_counts.keys()):
-            count = tag_counts[tag]
-            table.add_row(tag, str(count), key=tag)
+        for tag in {str(tag) for tag in contact.get('tags') or [] if tag not in (None, '')}:
+            self.adjust_tag_count(tag, sign)
+        self.stats['unique_tags'] = len(self.tag_counts)
+    
+    def show_contact_row(self, contact: Dict):
+        """Insert or update one contact's row in place, keeping the cursor on its contact.
+        
+        The loaded window always takes the change, so it is still there when
+        a search is cleared. During a search only rows already shown are
+        updated; otherwise the row is placed by name if it falls inside the
+        loaded window and removed if it moved out of it.
+        """
+        table = self.query_one("#contacts_table", DataTable)
+        row_key = RowKey(contact['id'])
+        cursor_key = self.cursor_row_key(table)
+        in_window = self.window.upsert(contact)
+        
+        if self.current_search:
+            self.filtered_contacts = [contact if entry['id'] == contact['id'] else entry
+                                      for entry in self.filtered_contacts]
+            if row_key in table.rows:
+                self.update_contact_cells(table, row_key, contact)
+            return
+        
+        if not in_window:
+            if row_key in table.rows:
+                table.remove_row(row_key)
+            self.restore_cursor(table, cursor_key)
+            return
+        
+        if row_key in table.rows:
+            moved = table.get_cell(row_key, self.contact_columns[1]) != contact.get('name', '')
+            self.update_contact_cells(table, row_key, contact)
+        else:
+            table.add_row(*self.contact_row_cells(contact), key=contact['id'])
+            moved = True
+        if moved:
+            self.sort_contacts_table(table)
+        self.restore_cursor(table, cursor_key)
+    
+    def hide_contact_row(self, contact_id: int):
+        """Remove a deleted contact's row, its window entry and its selection."""
+        table = self.query_one("#contacts_table", DataTable)
+        cursor_key = self.cursor_row_key(table)
+        self.window.remove(contact_id)
+        self.selected_ids.discard(contact_id)
+        self.filtered_contacts = [entry for entry in self.filtered_contacts if entry['id'] != contact_id]
+        if RowKey(contact_id) in table.rows:
+            table.remove_row(RowKey(contact_id))
+        self.restore_cursor(table, cursor_key)
+    
+    def update_contact_cells(self, table: DataTable, row_key: RowKey, contact: Dict):
+        for column_key, value in zip(self.contact_columns, self.contact_row_cells(contact)):
+            table.update_cell(row_key, column_key, value)
+    
+    def sort_contacts_table(self, table: DataTable):
+        """Order the loaded rows by (name, id) like list_contacts; cost is bounded by the window."""
+        # The ID cell may carry the selection mark, so the id is its last word
+        table.sort(self.contact_columns[1], self.id_column,
+                   key=lambda cells: (cells[0], int(str(cells[1]).split()[-1])))
+    
+    def cursor_row_key(self, table: DataTable) -> Optional[RowKey]:
+        if not table.row_count:
+            return None
+        return table.coordinate_to_cell_key(table.cursor_coordinate).row_key
+    
+    def restore_cursor(self, table: DataTable, row_key: Optional[RowKey]):
+        """Put the cursor back on ``row_key`` after rows around it moved."""
+        if row_key is not None and row_key in table.rows:
+            table.move_cursor(row=table.get_row_index(row_key), animate=False)
+    
+    def load_stats(self):
+        """Read the stats counters from the database and show them."""
+        self.stats = self.db.get_stats()
+        self.update_stats()
     
     def refresh_contacts(self):
         """Refresh contacts from database."""
-        self.contacts = self.db.get_all_contacts()
+        self.window.reset()
         self.filtered_contacts = []
         self.current_search = ""
     
     def update_stats(self):
         """Update the statistics panel."""
         stats_panel = self.query_one("#stats_panel", Static)
-        total_contacts = len(self.contacts)
-        total_tags = len(self.db.get_all_tags())
+        stats = self.stats
+        total_contacts = stats['total_contacts']
+        total_tags = stats['unique_tags']
         
         if self.current_search:
             showing = len(self.filtered_contacts)
             stats_text = f"📊 Showing {showing}/{total_contacts} contacts | {total_tags} unique tags | Search: '{self.current_search}'"
         else:
-            stats_text = f"📊 Total contacts: {total_contacts} | Unique tags: {total_tags}"
+            stats_text = (f"📊 Total contacts: {total_contacts} | Unique tags: {total_tags} | "
+                          f"Friends: {stats['friends']} | New this month: {stats['created_this_month']}")
+        
+        if self.selected_ids:
+            stats_text += f" | Selected: {len(self.selected_ids)}"
         
         stats_panel.update(stats_text)
     
@@ -419,7 +763,7 @@ class ContactManagerApp(App):
         def handle_result(result):
             if result:
                 try:
-                    self.db.add_contact(
+                    contact_id = self.db.add_contact(
                         name=result['name'],
                         nickname=result['nickname'],
                         birthday=result['birthday'],
@@ -430,9 +774,9 @@ class ContactManagerApp(App):
                         like_as_friend=result['like_as_friend'],
                         like_romantically=result['like_romantically']
                     )
-                    self.refresh_contacts()
-                    self.populate_contacts_table()
-                    self.populate_tags_table()
+                    contact = self.db.get_contact_by_id(contact_id)
+                    self.show_contact_row(contact)
+                    self.apply_contact_delta(contact, 1)
                     self.update_stats()
                     self.notify(f"Contact '{result['name']}' added successfully!", severity="success")
                 except Exception as e:
@@ -458,9 +802,82 @@ class ContactManagerApp(App):
         self.refresh_contacts()
         self.populate_contacts_table()
         self.populate_tags_table()
-        self.update_stats()
+        self.load_stats()
         self.notify("Contacts refreshed!", severity="info")
     
+    def action_toggle_select(self):
+        """Select or unselect the contact under the cursor for bulk actions."""
+        table = self.query_one("#contacts_table", DataTable)
+        if not table.row_count:
+            return
+        
+        row_key = table.coordinate_to_cell_key(table.cursor_coordinate).row_key
+        contact_id = row_key.value
+        if contact_id in self.selected_ids:
+            self.selected_ids.discard(contact_id)
+        else:
+            self.selected_ids.add(contact_id)
+        
+        table.update_cell(row_key, self.id_column, self.format_id_cell(contact_id))
+        table.move_cursor(row=table.cursor_row + 1)
+        self.update_stats()
+    
+    def action_tag_selected(self):
+        """Add a tag to, or remove it from, every selected contact."""
+        if not self.selected_ids:
+            self.notify("Select contacts with Space first", severity="warning")
+            return
+        
+        def handle_result(result):
+            if result:
+                try:
+                    tag = result['tag'].strip()
+                    if result['action'] == 'add':
+                        changed = self.db.add_tag_to_contacts(self.selected_ids, tag)
+                        message = f"Tagged {changed} contacts with '{tag}'"
+                        self.adjust_tag_count(tag, changed)
+                    else:
+                        changed = self.db.remove_tag_from_contacts(self.selected_ids, tag)
+                        message = f"Removed '{tag}' from {changed} contacts"
+                        self.adjust_tag_count(tag, -changed)
+                    self.stats['unique_tags'] = len(self.tag_counts)
+                    
+                    # Only the selected rows show different tags
+                    for contact_id in self.selected_ids:
+                        contact = self.db.get_contact_by_id(contact_id)
+                        if contact:
+                            self.show_contact_row(contact)
+                    self.update_stats()
+                    self.notify(message, severity="success")
+                except Exception as e:
+                    self.notify(f"Error tagging contacts: {str(e)}", severity="error")
+        
+        self.push_screen(TagPromptScreen(len(self.selected_ids)), handle_result)
+    
+    def action_delete_selected(self):
+        """Delete every selected contact after confirmation."""
+        if not self.selected_ids:
+            self.notify("Select contacts with Space first", severity="warning")
+            return
+        
+        def handle_result(confirmed):
+            if confirmed:
+                try:
+                    # Read them first so their share of the stats can be subtracted
+                    contacts = [self.db.get_contact_by_id(contact_id) for contact_id in self.selected_ids]
+                    deleted = self.db.delete_contacts(self.selected_ids)
+                    for contact in contacts:
+                        if contact:
+                            self.hide_contact_row(contact['id'])
+                            self.apply_contact_delta(contact, -1)
+                    self.selected_ids.clear()
+                    self.update_stats()
+                    self.notify(f"Deleted {deleted} contacts", severity="success")
+                except Exception as e:
+                    self.notify(f"Error deleting contacts: {str(e)}", severity="error")
+        
+        self.push_screen(ConfirmScreen(f"Delete {len(self.selected_ids)} selected contacts?"), handle_result)
+    
     def action_help(self):
         """Show help information."""
         help_text = """
@@ -471,6 +888,9 @@ class ContactManagerApp(App):
         • S - Focus search bar
         • E - Export to CSV
         • R - Refresh contacts
+        • Space - Select contact for bulk actions
+        • T - Add/remove a tag on selected contacts
+        • X - Delete selected contacts
         • Q - Quit application
         • ? - Show this help
         
@@ -479,7 +899,7 @@ class ContactManagerApp(App):
         • Enter - View contact details
         
         Search:
-        • Type in search bar to filter by name/tag
+        • Type in search bar to filter by name, tag, address or notes (word prefixes match)
         • Use "Filter by Tag" for tag-specific filtering
         """
         self.notify(help_text, timeout=10)
@@ -527,12 +947,12 @@ class ContactManagerApp(App):
     def on_data_table_row_selected(self, event: DataTable.RowSelected) -> None:
         """Handle row selection in data tables."""
         if event.data_table.id == "contacts_table":
-            contact_id = event.row_key
+            contact_id = event.row_key.value
             contact = self.db.get_contact_by_id(contact_id)
             if contact:
                 self.show_contact_detail(contact)
         elif event.data_table.id == "tags_table":
-            tag = event.row_key
+            tag = event.row_key.value
             self.perform_search(tag)
     
     def show_contact_detail(self, contact: Dict):
@@ -551,40 +971,44 @@ class ContactManagerApp(App):
         def handle_result(result):
             if result:
                 try:
+                    # Only write what changed, and refuse if the contact changed meanwhile
+                    changes = self.db.changed_fields(contact, result)
                     success = self.db.update_contact(
                         contact_id=result['id'],
-                        name=result['name'],
-                        nickname=result['nickname'],
-                        birthday=result['birthday'],
-                        address=result['address'],
-                        personality_notes=result['personality_notes'],
-                        social_media=result['social_media'],
-                        tags=result['tags'],
-                        like_as_friend=result['like_as_friend'],
-                        like_romantically=result['like_romantically']
+                        expected_version=contact.get('version'),
+                        **changes
                     )
                     if success:
-                        self.refresh_contacts()
-                        self.populate_contacts_table()
-                        self.populate_tags_table()
-                        self.update_stats()
+                        self.replace_contact(contact, self.db.get_contact_by_id(result['id']))
                         self.notify(f"Contact '{result['name']}' updated successfully!", severity="success")
                     else:
                         self.notify("Failed to update contact", severity="error")
+                except ConcurrentUpdateError:
+                    self.replace_contact(contact, self.db.get_contact_by_id(contact['id']))
+                    self.notify("Contact was changed elsewhere; reopen it to see the latest details", severity="warning")
                 except Exception as e:
                     self.notify(f"Error updating contact: {str(e)}", severity="error")
         
         self.push_screen(ContactFormScreen(contact, edit_mode=True), handle_result)
     
+    def replace_contact(self, old: Dict, new: Optional[Dict]):
+        """Show an edited contact: update its row and move stats and tag counts by the difference."""
+        self.apply_contact_delta(old, -1)
+        if new:
+            self.apply_contact_delta(new, 1)
+            self.show_contact_row(new)
+        else:
+            self.hide_contact_row(old['id'])
+        self.update_stats()
+    
     def delete_contact(self, contact: Dict):
         """Delete a contact after confirmation."""
         # In a more sophisticated app, you'd show a confirmation dialog
         try:
             success = self.db.delete_contact(contact['id'])
             if success:
-                self.refresh_contacts()
-                self.populate_contacts_table()
-                self.populate_tags_table()
+                self.hide_contact_row(contact['id'])
+                self.apply_contact_delta(contact, -1)
                 self.update_stats()
                 self.notify(f"Contact '{contact['name']}' deleted successfully!", severity="success")
             else:
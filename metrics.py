@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Operational metrics for The People DB
+Counters, gauges and histograms rendered in the Prometheus text exposition
+format, plus collectors for ContactDatabase cache, pool and query statistics
+"""
+
+import threading
+from typing import Callable, Dict, List, Tuple
+
+from database import ContactDatabase, QUERY_TIME_BUCKETS_MS
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Request latency bucket bounds in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Response size bucket bounds in bytes
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _format_labels(labels: Dict) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + '}'
+
+def _format_value(value) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+class Metric:
+    """Base for labelled metrics; one value (or histogram) per label combination."""
+    
+    kind = 'untyped'
+    
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+    
+    def _key(self, labels: Dict) -> tuple:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+    
+    def samples(self) -> List[Tuple[str, Dict, float]]:
+        """(sample name, labels, value) triples for rendering."""
+        with self._lock:
+            return [(self.name, dict(zip(self.labelnames, key)), value)
+                    for key, value in sorted(self._values.items())]
+    
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {_escape(self.documentation)}', f'# TYPE {self.name} {self.kind}']
+        for name, labels, value in self.samples():
+            lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+        return lines
+
+class Counter(Metric):
+    """Monotonically increasing count."""
+    
+    kind = 'counter'
+    
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+class Gauge(Metric):
+    """Value that can go up and down."""
+    
+    kind = 'gauge'
+    
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+    
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+    
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+class Histogram(Metric):
+    """Cumulative bucket counts, sum and count of observed values."""
+    
+    kind = 'histogram'
+    
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+    
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # [per-bucket counts (+Inf last), sum, count]
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][i] += 1
+                    break
+            else:
+                state[0][-1] += 1
+            state[1] += value
+            state[2] += 1
+    
+    def samples(self) -> List[Tuple[str, Dict, float]]:
+        with self._lock:
+            states = [(dict(zip(self.labelnames, key)), list(state[0]), state[1], state[2])
+                      for key, state in sorted(self._values.items())]
+        
+        samples = []
+        for labels, counts, total, count in states:
+            samples.extend(histogram_samples(self.name, labels, self.buckets, counts, total, count))
+        return samples
+
+def histogram_samples(name: str, labels: Dict, bounds, counts: List[int], total: float,
+                      count: int) -> List[Tuple[str, Dict, float]]:
+    """Samples for one histogram from per-bucket (non-cumulative) counts."""
+    samples = []
+    cumulative = 0
+    for bound, bucket_count in zip(list(bounds) + [float('inf')], counts):
+        cumulative += bucket_count
+        samples.append((f'{name}_bucket', dict(labels, le=_format_value(float(bound))), cumulative))
+    samples.append((f'{name}_sum', labels, total))
+    samples.append((f'{name}_count', labels, count))
+    return samples
+
+class Registry:
+    """Set of metrics plus callbacks that produce samples at scrape time."""
+    
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+    
+    def register(self, metric: Metric) -> Metric:
+        self._metrics.append(metric)
+        return metric
+    
+    def add_collector(self, collector: Callable[[], List[str]]):
+        """Add a callable returning already formatted exposition lines."""
+        self._collectors.append(collector)
+    
+    def render(self) -> str:
+        """The whole registry in the Prometheus text exposition format."""
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            lines.extend(collector())
+        return '\n'.join(lines) + '\n'
+
+def _family(name: str, kind: str, documentation: str, samples) -> List[str]:
+    lines = [f'# HELP {name} {_escape(documentation)}', f'# TYPE {name} {kind}']
+    for sample_name, labels, value in samples:
+        lines.append(f'{sample_name}{_format_labels(labels)} {_format_value(value)}')
+    return lines
+
+def database_collector(db: ContactDatabase) -> Callable[[], List[str]]:
+    """Collector for a ContactDatabase's read cache, pool, size and query timings.
+    
+    Query metrics are only present when the database was opened with
+    ``query_stats``. Scrapes read cached counters and one COUNT(*), so
+    they are cheap enough to run every few seconds.
+    """
+    def collect() -> List[str]:
+        cache = db.cache_stats()
+        pool = db.pool.stats()
+        lines = []
+        lines += _family('peopledb_contacts', 'gauge', 'Contacts in the database',
+                         [('peopledb_contacts', {}, db.count_contacts())])
+        lines += _family('peopledb_data_version', 'gauge', 'Current ContactDatabase.data_version()',
+                         [('peopledb_data_version', {}, db.data_version())])
+        for key, kind, doc in (('hits', 'counter', 'Read cache hits'),
+                               ('misses', 'counter', 'Read cache misses'),
+                               ('evictions', 'counter', 'Read cache LRU evictions'),
+                               ('invalidations', 'counter', 'Read cache invalidations by data changes'),
+                               ('entries', 'gauge', 'Entries in the read cache')):
+            suffix = '_total' if kind == 'counter' else ''
+            name = f'peopledb_read_cache_{key}{suffix}'
+            lines += _family(name, kind, doc, [(name, {}, cache[key])])
+        for key, doc in (('size', 'Maximum pooled connections'),
+                         ('open', 'Open pooled connections'),
+                         ('in_use', 'Pooled connections checked out')):
+            name = f'peopledb_pool_connections_{key}'
+            lines += _family(name, 'gauge', doc, [(name, {}, pool[key])])
+        
+        if db.query_stats is not None:
+            snapshot = db.query_stats.snapshot()
+            bounds = [bound / 1000 for bound in QUERY_TIME_BUCKETS_MS]
+            samples = []
+            rows = []
+            for method, summary in sorted(snapshot['methods'].items()):
+                samples += histogram_samples('peopledb_query_duration_seconds', {'method': method}, bounds,
+                                             list(summary['buckets'].values()),
+                                             summary['total_ms'] / 1000, summary['count'])
+                rows.append(('peopledb_query_rows_total', {'method': method}, summary['rows']))
+            lines += _family('peopledb_query_duration_seconds', 'histogram',
+                             'SQL statement time by calling ContactDatabase method', samples)
+            lines += _family('peopledb_query_rows_total', 'counter',
+                             'Rows returned or changed by SQL statements', rows)
+            lines += _family('peopledb_slow_queries_total', 'counter',
+                             f"SQL statements slower than {snapshot['slow_threshold_ms']} ms",
+                             [('peopledb_slow_queries_total', {}, snapshot['slow_total'])])
+        return lines
+    
+    return collect
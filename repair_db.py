@@ -22,6 +22,10 @@ def repair_database(db_path='contacts.db'):
         conn = sqlite3.connect(db_path)
         cursor = conn.cursor()
         
+        # Repaired tags must also be reflected in the normalized tag index
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'contact_tags'")
+        has_tag_index = cursor.fetchone() is not None
+        
         # Get all contacts
         cursor.execute('SELECT id, social_media, tags FROM contacts')
         rows = cursor.fetchall()
@@ -82,6 +86,32 @@ def repair_database(db_path='contacts.db'):
                     SET social_media = ?, tags = ?, updated_at = CURRENT_TIMESTAMP
                     WHERE id = ?
                 ''', (new_social_media, new_tags, contact_id))
+                
+                if has_tag_index and new_tags != tags:
+                    cursor.execute('DELETE FROM contact_tags WHERE contact_id = ?', (contact_id,))
+                    cursor.executemany(
+                        'INSERT OR IGNORE INTO contact_tags (contact_id, tag) VALUES (?, ?)',
+                        [(contact_id, str(tag)) for tag in json.loads(new_tags) if tag not in (None, '')]
+                    )
+                repairs_made += 1
+        
+        # Recompute the per-tag summary in case its triggers ever missed a change
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tag_counts'")
+        if cursor.fetchone() is not None:
+            cursor.execute('''
+                SELECT COUNT(*) FROM (
+                    SELECT tag, COUNT(*) AS count FROM contact_tags GROUP BY tag
+                    EXCEPT SELECT tag, count FROM tag_counts
+                )
+            ''')
+            stale_counts = cursor.fetchone()[0]
+            cursor.execute('SELECT COUNT(*) FROM tag_counts WHERE tag NOT IN (SELECT tag FROM contact_tags)')
+            stale_counts += cursor.fetchone()[0]
+            
+            cursor.execute('DELETE FROM tag_counts')
+            cursor.execute('INSERT INTO tag_counts (tag, count) SELECT tag, COUNT(*) FROM contact_tags GROUP BY tag')
+            if stale_counts:
+                print(f"🔧 Rebuilt tag counts ({stale_counts} tags were out of date)")
                 repairs_made += 1
         
         conn.commit()
@@ -17,8 +17,9 @@ def show_menu():
     print("1. 🌐 Web Interface (Flask) - Modern web app with Bootstrap")
     print("2. 🖥️  TUI Interface (Textual) - Modern terminal interface")
     print("3. 📝 CLI Interface (Simple) - Basic command-line interface")
-    print("4. ℹ️  Show Information")
-    print("5. ❌ Exit")
+    print("4. 📥 Import Contacts (CSV/NDJSON)")
+    print("5. ℹ️  Show Information")
+    print("6. ❌ Exit")
     print("="*60)
 
 def run_web_interface():
@@ -65,6 +66,13 @@ def run_cli_interface():
     except Exception as e:
         print(f"❌ Error starting CLI: {e}")
 
+def run_import():
+    try:
+        from cli import SimpleContactCLI
+        SimpleContactCLI().import_contacts()
+    except Exception as e:
+        print(f"❌ Error importing contacts: {e}")
+
 def show_info():
     print("\n" + "="*60)
     print("ℹ️  THE PEOPLE DB INFORMATION")
@@ -73,7 +81,7 @@ def show_info():
     print("   • Add, view, edit, and delete contacts")
     print("   • Store: name, nickname, birthday, notes, social media, tags")
     print("   • Search and filter by name or tags")
-    print("   • Export to CSV format")
+    print("   • Export to CSV format, import from CSV or NDJSON")
     print("   • SQLite database for reliable storage")
     print()
     print("🖥️  Interface Options:")
@@ -85,6 +93,7 @@ def show_info():
     print("   • app.py - Flask web application")
     print("   • main.py - Textual TUI application")
     print("   • cli.py - Simple CLI application")
+    print("   • importer.py - CSV/NDJSON import pipeline")
     print("   • database.py - SQLite database operations")
     print("   • contacts.db - SQLite database file (auto-created)")
     print()
@@ -100,7 +109,7 @@ def main():
     while True:
         try:
             show_menu()
-            choice = input("\nEnter your choice (1-5): ").strip()
+            choice = input("\nEnter your choice (1-6): ").strip()
             
             if choice == '1':
                 run_web_interface()
@@ -109,13 +118,16 @@ def main():
             elif choice == '3':
                 run_cli_interface()
             elif choice == '4':
-                show_info()
+                run_import()
                 input("\nPress Enter to continue...")
             elif choice == '5':
+                show_info()
+                input("\nPress Enter to continue...")
+            elif choice == '6':
                 print("\n👋 Goodbye!")
                 sys.exit(0)
             else:
-                print("❌ Invalid choice. Please enter 1-5.")
+                print("❌ Invalid choice. Please enter 1-6.")
                 input("Press Enter to continue...")
                 
         except KeyboardInterrupt: